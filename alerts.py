@@ -0,0 +1,74 @@
+import time
+
+from PyQt5.QtCore import QObject, QUrl
+from PyQt5.QtMultimedia import QSoundEffect
+
+
+class AlertPlayer(QObject):
+    VOICES = 4
+    LATENCY_SAMPLES = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._voices = {}  # sound name -> list of QSoundEffect
+        self._next_voice = {}
+        self._triggered = {}  # voice -> perf_counter() of the play() call
+        self.latencies_ms = []
+
+    def load(self, name, path, voices=VOICES):
+        # QSoundEffect decodes the whole file into memory, and Qt shares the
+        # decoded sample between effects with the same source, so extra
+        # voices cost a playback slot rather than another copy of the audio.
+        url = QUrl.fromLocalFile(path)
+        pool = []
+        for _ in range(voices):
+            voice = QSoundEffect(self)
+            voice.setSource(url)
+            voice.playingChanged.connect(lambda voice=voice: self._on_playing_changed(voice))
+            pool.append(voice)
+        self._voices[name] = pool
+        self._next_voice[name] = 0
+
+    def is_loaded(self, name):
+        return name in self._voices
+
+    def play(self, name):
+        pool = self._voices.get(name)
+        if not pool:
+            return
+        # Prefer an idle voice so overlapping alerts do not cut each other off.
+        voice = next((voice for voice in pool if not voice.isPlaying()), None)
+        if voice is None:
+            index = self._next_voice[name]
+            self._next_voice[name] = (index + 1) % len(pool)
+            voice = pool[index]
+            voice.stop()
+        voice.setMuted(False)
+        self._triggered[voice] = time.perf_counter()
+        voice.play()
+
+    def warm_up(self, name):
+        # Play one voice muted so the audio backend is awake when the real
+        # alert fires.
+        pool = self._voices.get(name)
+        if not pool:
+            return
+        voice = next((voice for voice in pool if not voice.isPlaying()), None)
+        if voice is not None:
+            voice.setMuted(True)
+            voice.play()
+
+    def _on_playing_changed(self, voice):
+        triggered = self._triggered.pop(voice, None)
+        if triggered is not None and voice.isPlaying():
+            self.latencies_ms.append((time.perf_counter() - triggered) * 1000)
+            del self.latencies_ms[:-self.LATENCY_SAMPLES]
+
+    def stats(self):
+        latencies = self.latencies_ms
+        return {
+            'samples': len(latencies),
+            'last_latency_ms': latencies[-1] if latencies else None,
+            'max_latency_ms': max(latencies) if latencies else None,
+            'mean_latency_ms': sum(latencies) / len(latencies) if latencies else None,
+        }
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# Headless benchmarks for the timer core. Runs simulated sessions on a
+# virtual clock, so thousands of pomodoros replay in well under a second.
+import argparse
+import datetime
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from history import SessionHistory
+from task_search import TaskIndex, iter_slots
+from timer_core import PomodoroCore, Session, VirtualClock
+from timer_scheduler import TimerPool
+
+
+def simulate_cycles(core, clock, cycles):
+    ticks = 0
+    for _ in range(cycles):
+        for _ in range(2):  # one work session, then one break
+            core.start()
+            while not core.poll():
+                clock.advance(core.countdown.next_boundary())
+                core.display_seconds()
+                ticks += 1
+            core.toggle_break()
+            core.pause()
+    return ticks
+
+
+def bench_cycles(cycles):
+    clock = VirtualClock()
+    core = PomodoroCore(clock=clock, wall_clock=clock)
+    started = time.perf_counter()
+    ticks = simulate_cycles(core, clock, cycles)
+    elapsed = time.perf_counter() - started
+    return {
+        'cycles': cycles,
+        'ticks': ticks,
+        'transitions': core.transitions,
+        'simulated_hours': clock.now / 3600,
+        'elapsed_s': elapsed,
+        'ticks_per_s': ticks / elapsed,
+    }
+
+
+def run_transitions(core, clock, transitions):
+    for _ in range(transitions // 2):
+        core.toggle()
+        clock.advance(0.25)
+        core.poll()
+        core.toggle()
+
+
+def bench_transitions(transitions):
+    clock = VirtualClock()
+    core = PomodoroCore(clock=clock, wall_clock=clock)
+    simulate_cycles(core, clock, 1)  # warm up lazily created objects
+    started = time.perf_counter()
+    run_transitions(core, clock, transitions)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    before_blocks = sys.getallocatedblocks()
+    before_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    run_transitions(core, clock, transitions)
+    after_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    after_blocks = sys.getallocatedblocks()
+    tracemalloc.stop()
+    return {
+        'transitions': transitions,
+        'elapsed_s': elapsed,
+        'transitions_per_s': transitions / elapsed,
+        'retained_bytes_per_transition': (after_bytes - before_bytes) / transitions,
+        'retained_blocks_per_transition': (after_blocks - before_blocks) / transitions,
+        'peak_transient_bytes': peak_bytes - before_bytes,
+    }
+
+
+def bench_multi_timer(timers, hours):
+    clock = VirtualClock()
+    tracemalloc.start()
+    before_bytes, _ = tracemalloc.get_traced_memory()
+    pool = TimerPool(clock=clock)
+    for index in range(timers):
+        pool.add(f'Timer {index}')
+        pool.apply(index, 'start')
+        clock.advance(60 / timers)  # stagger the starts across a minute
+    per_timer_bytes = (tracemalloc.get_traced_memory()[0] - before_bytes) / timers
+    tracemalloc.stop()
+
+    end = clock.now + hours * 3600
+    wakeups = expiries = 0
+    started = time.perf_counter()
+    while True:
+        deadline = pool.next_deadline()
+        if deadline is None or deadline > end:
+            break
+        clock.now = deadline
+        wakeups += 1
+        for index in pool.expire_due():
+            expiries += 1
+            pool.apply(index, 'toggle_break')  # roll straight into the next phase
+    elapsed = time.perf_counter() - started
+    return {
+        'timers': timers,
+        'simulated_hours': hours,
+        'bytes_per_timer': per_timer_bytes,
+        'expiries': expiries,
+        'scheduler_wakeups': wakeups,
+        'wakeups_per_timer_hour': wakeups / timers / hours,
+        'one_hz_wakeups_per_timer_hour': 3600,
+        'elapsed_s': elapsed,
+    }
+
+
+def bench_search(tasks, page=100):
+    rng = random.Random(1)
+    words = [''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=rng.randint(3, 9))) for _ in range(5000)]
+    weights = [1 / (rank + 1) for rank in range(len(words))]  # Zipf-like, as in real task text
+    rows = [
+        (task_id, task_id, ' '.join(rng.choices(words, weights, k=rng.randint(3, 8))) + f' #{task_id}')
+        for task_id in range(1, tasks + 1)
+    ]
+    started = time.perf_counter()
+    index = TaskIndex(rows)
+    build = time.perf_counter() - started
+
+    # Type a few common and rare words one character at a time, fetching the
+    # first page of results after every keystroke like the task list does.
+    keystrokes = []
+    for word in words[:10] + rng.sample(words, 10):
+        for length in range(1, len(word) + 1):
+            started = time.perf_counter()
+            mask = index.search(word[:length])
+            list(itertools.islice(iter_slots(mask), page))
+            keystrokes.append(time.perf_counter() - started)
+    keystrokes.sort()
+    return {
+        'tasks': tasks,
+        'build_s': build,
+        'keystrokes': len(keystrokes),
+        'median_keystroke_ms': keystrokes[len(keystrokes) // 2] * 1000,
+        'max_keystroke_ms': keystrokes[-1] * 1000,
+    }
+
+
+def bench_history(days, per_day=12, repeats=20):
+    # The stats view asks for focus minutes per day and weekly totals over
+    # the whole range; both should read the rollups, not scan the journal.
+    rng = random.Random(2)
+    history = SessionHistory(os.path.join(tempfile.mkdtemp(), 'history.sqlite3'))
+    today = datetime.date.today()
+    first_day = today - datetime.timedelta(days=days - 1)
+    started = time.perf_counter()
+    for offset in range(days):
+        morning = datetime.datetime.combine(first_day + datetime.timedelta(days=offset), datetime.time(9)).timestamp()
+        for index in range(per_day):
+            started_at = morning + index * 1800
+            elapsed = rng.choice((1500, 1500, 1500, rng.uniform(60, 1500)))
+            kind = 'work' if index % 2 == 0 else 'break'
+            history.record(Session(kind, started_at, started_at + elapsed, elapsed, elapsed == 1500, rng.randint(0, 2)))
+    record = (time.perf_counter() - started) / (days * per_day)
+
+    def timed(query):
+        started = time.perf_counter()
+        for _ in range(repeats):
+            query()
+        return (time.perf_counter() - started) / repeats
+
+    daily = timed(lambda: history.focus_minutes_per_day(days, today))
+    weekly = timed(lambda: history.weekly_totals(first_day, today))
+    scan = timed(lambda: history.connection.execute(
+        "SELECT day, SUM(elapsed) FROM sessions WHERE kind = 'work' AND day BETWEEN ? AND ? GROUP BY day",
+        (first_day.toordinal(), today.toordinal()),
+    ).fetchall())
+    started = time.perf_counter()
+    history.rebuild_rollups()
+    rebuild = time.perf_counter() - started
+    history.close()
+    return {
+        'days': days,
+        'sessions': days * per_day,
+        'record_ms_per_session': record * 1000,
+        'focus_per_day_ms': daily * 1000,
+        'weekly_totals_ms': weekly * 1000,
+        'journal_scan_ms': scan * 1000,
+        'rebuild_rollups_ms': rebuild * 1000,
+    }
+
+
+def bench_subscribers(subscribers, ticks=200):
+    # Publishing runs inside the tick slot, so its cost is added to tick
+    # latency. Compares the publish cost with and without subscribers, and
+    # measures how long until every subscriber has read a tick.
+    from PyQt5.QtCore import QCoreApplication
+    from PyQt5.QtNetwork import QLocalSocket
+    from control_server import ControlServer
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    server = ControlServer({})
+    path = os.path.join(tempfile.mkdtemp(), 'bench.sock')
+    if not server.listen(path):
+        raise RuntimeError(server.error)
+    event = {'event': 'tick', 'seconds': 1499, 'display': '24:59'}
+
+    def publish_cost():
+        started = time.perf_counter()
+        for _ in range(ticks):
+            server.publish(event)
+        return (time.perf_counter() - started) / ticks
+
+    idle = publish_cost()
+    clients = []
+    for _ in range(subscribers):
+        client = QLocalSocket()
+        client.connectToServer(path)
+        client.waitForConnected(1000)
+        client.write(b'{"cmd": "subscribe"}\n')
+        clients.append(client)
+        app.processEvents()  # accept it before the listen backlog fills up
+    while len(server.subscribers) < subscribers:
+        app.processEvents()
+    for client in clients:
+        app.processEvents()
+        client.readAll()
+
+    busy = publish_cost()
+    for client in clients:
+        client.readAll()
+    delivery = []
+    for _ in range(20):
+        started = time.perf_counter()
+        server.publish(event)
+        waiting = set(clients)
+        while waiting:
+            app.processEvents()
+            waiting = {client for client in waiting if not client.canReadLine()}
+        delivery.append(time.perf_counter() - started)
+        for client in clients:
+            client.readAll()
+    for client in clients:
+        client.abort()
+    server.close()
+    delivery.sort()
+    return {
+        'subscribers': subscribers,
+        'publish_us_no_subscribers': idle * 1e6,
+        'publish_us_per_tick': busy * 1e6,
+        'median_delivery_ms': delivery[len(delivery) // 2] * 1000,
+        'max_delivery_ms': delivery[-1] * 1000,
+    }
+
+
+def print_report(title, results):
+    print(title)
+    for key, value in results.items():
+        if isinstance(value, float):
+            print(f'  {key:32} {value:,.3f}')
+        else:
+            print(f'  {key:32} {value:,}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pomodoro timer benchmarks')
+    parser.add_argument('--cycles', type=int, default=500, help='work/break cycles to simulate')
+    parser.add_argument('--transitions', type=int, default=100000, help='play/pause transitions to time and probe for allocations')
+    parser.add_argument('--timers', type=int, default=500, help='concurrent timers for the multi-timer run')
+    parser.add_argument('--hours', type=float, default=8, help='simulated hours for the multi-timer run')
+    parser.add_argument('--tasks', type=int, default=50000, help='tasks to index for the search run')
+    parser.add_argument('--history-days', type=int, default=730, help='days of session history for the stats query run')
+    parser.add_argument('--subscribers', type=int, default=100, help='control socket subscribers for the tick fan-out run')
+    args = parser.parse_args(argv)
+
+    print_report('Simulated cycles', bench_cycles(args.cycles))
+    print_report('Transitions', bench_transitions(args.transitions))
+    print_report('Multi-timer scheduler', bench_multi_timer(args.timers, args.hours))
+    print_report('Task search', bench_search(args.tasks))
+    print_report('Session history', bench_history(args.history_days))
+    print_report('Tick fan-out', bench_subscribers(args.subscribers))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import os
+import struct
+import time
+
+
+# magic, version, is_break, state, pad, deadline, remaining, duration,
+# started_at, interruptions, pad, task_id (-1 for none)
+LAYOUT = struct.Struct('<4sBBBxddddI4xq')
+MAGIC = b'POMO'
+VERSION = 1
+
+IDLE, ACTIVE, PAUSED = 0, 1, 2
+
+
+class Checkpoint:
+    # One fixed-size record describing the session in progress. It is
+    # rewritten on transitions only, never per tick: the absolute wall-clock
+    # deadline is enough to work out the remaining time after a restart.
+    def __init__(self, path):
+        self.path = path
+        self.writes = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def save(self, core, task_id=None, now=None):
+        now = time.time() if now is None else now
+        remaining = core.remaining()
+        if not core.is_running:
+            state = IDLE
+        elif core.is_active:
+            state = ACTIVE
+        else:
+            state = PAUSED
+        data = LAYOUT.pack(
+            MAGIC, VERSION, int(core.is_break), state,
+            now + remaining, remaining, core.countdown.duration,
+            core.session_started_at or 0.0, core.interruptions,
+            -1 if task_id is None else task_id,
+        )
+        # Write a sibling file and rename it over the old one, so a crash
+        # mid-write leaves either the previous or the new record.
+        temporary = self.path + '.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(data)
+        os.replace(temporary, self.path)
+        self.writes += 1
+
+    def load(self):
+        try:
+            with open(self.path, 'rb') as file:
+                data = file.read(LAYOUT.size + 1)
+        except OSError:
+            return None
+        if len(data) != LAYOUT.size:
+            return None
+        (magic, version, is_break, state, deadline, remaining, duration,
+         started_at, interruptions, task_id) = LAYOUT.unpack(data)
+        if magic != MAGIC or version != VERSION or state not in (IDLE, ACTIVE, PAUSED):
+            return None
+        return {
+            'is_break': bool(is_break),
+            'state': state,
+            'deadline': deadline,
+            'remaining': remaining,
+            'duration': duration,
+            'started_at': started_at or None,
+            'interruptions': interruptions,
+            'task_id': None if task_id < 0 else task_id,
+        }
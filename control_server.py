@@ -0,0 +1,138 @@
+import json
+import os
+
+from PyQt5.QtCore import QObject, QStandardPaths, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+from instrumentation import metrics
+
+
+def default_socket_path():
+    base = QStandardPaths.writableLocation(QStandardPaths.RuntimeLocation) or QStandardPaths.writableLocation(QStandardPaths.TempLocation)
+    return os.path.join(base, 'pomodoro.sock')
+
+
+class ControlServer(QObject):
+    # Line-delimited JSON over a local socket. Every request is an object
+    # with a "cmd" key; the reply echoes its "id" and carries "ok". After
+    # {"cmd": "subscribe"} the client also receives {"event": ...} lines.
+    subscribers_changed = pyqtSignal(int)
+
+    MAX_LINE = 4 * 1024 * 1024
+    MAX_BACKLOG = 256 * 1024  # unread bytes before a subscriber is dropped
+    PROBE_TIMEOUT_MS = 200
+
+    def __init__(self, commands, parent=None):
+        super().__init__(parent)
+        self.commands = commands  # command name -> callable(request) returning a dict or None
+        self.clients = set()
+        self.subscribers = set()
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self._on_new_connection)
+        self.error = None
+
+    def listen(self, path=None):
+        path = path or default_socket_path()
+        if self._is_served(path):
+            # Another instance owns the socket; taking it over would leave
+            # its clients talking to whichever process exits first.
+            self.error = f'another instance is listening on {path}'
+            return False
+        QLocalServer.removeServer(path)  # clear a socket left behind by a crash
+        if not self.server.listen(path):
+            self.error = self.server.errorString()
+            return False
+        self.error = None
+        return True
+
+    def _is_served(self, path):
+        probe = QLocalSocket()
+        probe.connectToServer(path)
+        served = probe.waitForConnected(self.PROBE_TIMEOUT_MS)
+        probe.abort()
+        return served
+
+    def close(self):
+        self.server.close()
+        for client in list(self.clients):
+            client.disconnectFromServer()
+
+    def publish(self, event):
+        if not self.subscribers:
+            return
+        data = self._encode(event)
+        for client in list(self.subscribers):
+            if client.bytesToWrite() > self.MAX_BACKLOG:
+                # A subscriber that stopped reading must not grow our memory
+                # or slow down everyone else.
+                self._drop(client)
+            else:
+                client.write(data)
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            client = self.server.nextPendingConnection()
+            self.clients.add(client)
+            client.readyRead.connect(lambda client=client: self._on_ready_read(client))
+            client.disconnected.connect(lambda client=client: self._drop(client))
+
+    def _drop(self, client):
+        self.clients.discard(client)
+        self._set_subscribed(client, False)
+        client.abort()
+        client.deleteLater()
+
+    def _on_ready_read(self, client):
+        while client.canReadLine():
+            line = bytes(client.readLine()).strip()
+            if line:
+                client.write(self._encode(self._handle(client, line)))
+        if client.bytesAvailable() > self.MAX_LINE:
+            self._drop(client)
+
+    def _handle(self, client, line):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('request must be a JSON object')
+        except ValueError as error:
+            return {'ok': False, 'error': f'invalid request: {error}'}
+        reply = {'id': request['id']} if 'id' in request else {}
+        command = request.get('cmd')
+        if not isinstance(command, str):
+            reply.update(ok=False, error=f'unknown command: {command!r}')
+            return reply
+        metrics.count(f'control_{command}')
+        if command in ('subscribe', 'unsubscribe'):
+            self._set_subscribed(client, command == 'subscribe')
+            reply['ok'] = True
+            return reply
+        handler = self.commands.get(command)
+        if handler is None:
+            reply.update(ok=False, error=f'unknown command: {command!r}')
+            return reply
+        try:
+            result = handler(request)
+        except Exception as error:
+            # This runs inside a Qt slot, where an escaping exception aborts
+            # the whole process; a bad request only fails its own reply.
+            reply.update(ok=False, error=str(error) or type(error).__name__)
+            return reply
+        reply['ok'] = True
+        if result:
+            reply.update(result)
+        return reply
+
+    def _set_subscribed(self, client, subscribed):
+        count = len(self.subscribers)
+        if subscribed:
+            self.subscribers.add(client)
+        else:
+            self.subscribers.discard(client)
+        if len(self.subscribers) != count:
+            self.subscribers_changed.emit(len(self.subscribers))
+
+    @staticmethod
+    def _encode(message):
+        return (json.dumps(message, separators=(',', ':')) + '\n').encode()
@@ -0,0 +1,140 @@
+import datetime
+import os
+import sqlite3
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    ended_at REAL NOT NULL,
+    day INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    elapsed REAL NOT NULL,
+    completed INTEGER NOT NULL,
+    interruptions INTEGER NOT NULL,
+    task_id INTEGER,
+    task TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_day ON sessions (day);
+CREATE INDEX IF NOT EXISTS sessions_task ON sessions (task_id);
+CREATE TABLE IF NOT EXISTS daily_rollup (
+    day INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    sessions INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    interruptions INTEGER NOT NULL,
+    PRIMARY KEY (day, kind)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS weekly_rollup (
+    week INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    sessions INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    interruptions INTEGER NOT NULL,
+    PRIMARY KEY (week, kind)
+) WITHOUT ROWID;
+"""
+
+ROLLUP_UPSERT = """
+INSERT INTO {table} ({column}, kind, sessions, completed, seconds, interruptions)
+VALUES (?, ?, 1, ?, ?, ?)
+ON CONFLICT ({column}, kind) DO UPDATE SET
+    sessions = sessions + 1,
+    completed = completed + excluded.completed,
+    seconds = seconds + excluded.seconds,
+    interruptions = interruptions + excluded.interruptions
+"""
+
+
+def day_number(timestamp):
+    # Local calendar day as a proleptic Gregorian ordinal.
+    return datetime.date.fromtimestamp(timestamp).toordinal()
+
+
+def week_number(day):
+    # Ordinal of the Monday that starts the week containing day.
+    return day - datetime.date.fromordinal(day).weekday()
+
+
+class SessionHistory:
+    def __init__(self, path):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def record(self, session, task_id=None, task=None):
+        day = day_number(session.started_at)
+        completed = int(session.completed)
+        with self.connection:
+            self.connection.execute(
+                'INSERT INTO sessions (started_at, ended_at, day, kind, elapsed, completed, interruptions, task_id, task) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (session.started_at, session.ended_at, day, session.kind, session.elapsed,
+                 completed, session.interruptions, task_id, task),
+            )
+            rollup = (session.kind, completed, session.elapsed, session.interruptions)
+            self.connection.execute(ROLLUP_UPSERT.format(table='daily_rollup', column='day'), (day,) + rollup)
+            self.connection.execute(ROLLUP_UPSERT.format(table='weekly_rollup', column='week'), (week_number(day),) + rollup)
+
+    def daily_totals(self, first_day, last_day, kind='work'):
+        # Returns (date, sessions, completed, seconds, interruptions) for days with activity.
+        rows = self.connection.execute(
+            'SELECT day, sessions, completed, seconds, interruptions FROM daily_rollup '
+            'WHERE kind = ? AND day BETWEEN ? AND ? ORDER BY day',
+            (kind, first_day.toordinal(), last_day.toordinal()),
+        )
+        return [(datetime.date.fromordinal(day),) + tuple(rest) for day, *rest in rows]
+
+    def weekly_totals(self, first_day, last_day, kind='work'):
+        rows = self.connection.execute(
+            'SELECT week, sessions, completed, seconds, interruptions FROM weekly_rollup '
+            'WHERE kind = ? AND week BETWEEN ? AND ? ORDER BY week',
+            (kind, week_number(first_day.toordinal()), week_number(last_day.toordinal())),
+        )
+        return [(datetime.date.fromordinal(week),) + tuple(rest) for week, *rest in rows]
+
+    def focus_minutes_per_day(self, days, today=None):
+        today = today or datetime.date.today()
+        first_day = today - datetime.timedelta(days=days - 1)
+        return [(day, seconds / 60) for day, _, _, seconds, _ in self.daily_totals(first_day, today)]
+
+    def task_sessions(self, task_id):
+        return self.connection.execute(
+            'SELECT started_at, ended_at, kind, elapsed, completed, interruptions FROM sessions '
+            'WHERE task_id = ? ORDER BY started_at',
+            (task_id,),
+        ).fetchall()
+
+    def rebuild_rollups(self):
+        # Recompute both rollup tables from the session journal.
+        with self.connection:
+            self.connection.execute('DELETE FROM daily_rollup')
+            self.connection.execute('DELETE FROM weekly_rollup')
+            self.connection.execute(
+                'INSERT INTO daily_rollup (day, kind, sessions, completed, seconds, interruptions) '
+                'SELECT day, kind, COUNT(*), SUM(completed), SUM(elapsed), SUM(interruptions) '
+                'FROM sessions GROUP BY day, kind'
+            )
+            weeks = {}
+            for day, kind, sessions, completed, seconds, interruptions in self.connection.execute(
+                'SELECT day, kind, sessions, completed, seconds, interruptions FROM daily_rollup'
+            ):
+                totals = weeks.setdefault((week_number(day), kind), [0, 0, 0.0, 0])
+                totals[0] += sessions
+                totals[1] += completed
+                totals[2] += seconds
+                totals[3] += interruptions
+            self.connection.executemany(
+                'INSERT INTO weekly_rollup (week, kind, sessions, completed, seconds, interruptions) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [key + tuple(totals) for key, totals in weeks.items()],
+            )
@@ -0,0 +1,143 @@
+import bisect
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import time
+
+from PyQt5.QtCore import Qt, QObject, QTimer, QCoreApplication
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class Histogram:
+    def __init__(self, bounds=BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last bucket is overflow
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self):
+        buckets = {f'le_{bound}': count for bound, count in zip(self.bounds, self.counts)}
+        buckets['overflow'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            'buckets': buckets,
+        }
+
+
+class Metrics(QObject):
+    # Every recording call starts with an `enabled` check, so leaving the
+    # hooks in place costs one attribute lookup when metrics are off.
+    LAG_PROBE_MS = 1000
+    SNAPSHOT_INTERVAL_MS = 60 * 1000
+
+    def __init__(self):
+        super().__init__()
+        self.enabled = False
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}  # name -> callable returning a JSON-serializable value
+        self.logger = None
+        self._lag_timer = None
+        self._snapshot_timer = None
+        self._lag_expected = None
+
+    def enable(self, log_path=None, max_bytes=1024 * 1024, backups=3):
+        if self.enabled:
+            return
+        self.enabled = True
+        if log_path:
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backups)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.logger = logging.getLogger('pomodoro.metrics')
+            self.logger.setLevel(logging.INFO)
+            self.logger.propagate = False
+            self.logger.addHandler(handler)
+        # Event-loop lag: a precise timer that should fire every second; any
+        # extra delay is time the loop spent busy elsewhere.
+        self._lag_timer = QTimer(self)
+        self._lag_timer.setTimerType(Qt.PreciseTimer)
+        self._lag_timer.timeout.connect(self._on_lag_probe)
+        self._lag_expected = time.monotonic() + self.LAG_PROBE_MS / 1000
+        self._lag_timer.start(self.LAG_PROBE_MS)
+        self._snapshot_timer = QTimer(self)
+        self._snapshot_timer.setTimerType(Qt.VeryCoarseTimer)
+        self._snapshot_timer.timeout.connect(self.log_snapshot)
+        self._snapshot_timer.start(self.SNAPSHOT_INTERVAL_MS)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.log_snapshot)
+
+    def observe(self, name, value):
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(value)
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name, callback):
+        self.gauges[name] = callback
+
+    def timed(self, name):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, (time.perf_counter() - started) * 1000)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        snapshot = {
+            'ts': time.time(),
+            'enabled': self.enabled,
+            'histograms_ms': {name: histogram.snapshot() for name, histogram in self.histograms.items()},
+            'counters': dict(self.counters),
+        }
+        if resource is not None:
+            # ru_maxrss is the process high-water mark: KiB on Linux, bytes on macOS.
+            snapshot['max_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        for name, callback in self.gauges.items():
+            snapshot[name] = callback()
+        return snapshot
+
+    def log_snapshot(self):
+        if self.logger is not None:
+            self.logger.info(json.dumps(self.snapshot(), default=str))
+
+    def _on_lag_probe(self):
+        now = time.monotonic()
+        self.observe('event_loop_lag', max(0.0, (now - self._lag_expected) * 1000))
+        self._lag_expected = now + self.LAG_PROBE_MS / 1000
+
+
+metrics = Metrics()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# Many independent pomodoros in one process, e.g. for a team-room display:
+#   python3 multi_timer.py Alice Bob Carol
+#   python3 multi_timer.py --count 500
+import argparse
+import math
+import os
+import sys
+
+from PyQt5.QtCore import Qt, QObject, QTimer, QSize, QAbstractListModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtWidgets import QApplication, QListView, QShortcut, QVBoxLayout, QWidget
+
+from resources import ICON_PATH
+from timer_scheduler import TimerPool
+
+
+class MultiTimerBoard(QObject):
+    expired = pyqtSignal(int)
+
+    def __init__(self, pool=None, parent=None):
+        super().__init__(parent)
+        self.pool = pool if pool is not None else TimerPool()
+        self.wakeups = 0
+        # A single timer armed for the earliest deadline in the pool; idle
+        # timers cost nothing and running ones only wake us when they end.
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def apply(self, index, action):
+        self.pool.apply(index, action)
+        self._arm()
+
+    def _arm(self):
+        deadline = self.pool.next_deadline()
+        if deadline is None:
+            self._timer.stop()
+            return
+        self._timer.start(max(0, int(math.ceil((deadline - self.pool.clock()) * 1000))))
+
+    def _on_timeout(self):
+        self.wakeups += 1
+        for index in self.pool.expire_due():
+            self.expired.emit(index)
+        self._arm()
+
+
+class MultiTimerModel(QAbstractListModel):
+    def __init__(self, pool, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.pool)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        core = self.pool.cores[index.row()]
+        if role == Qt.DisplayRole:
+            seconds = core.display_seconds()
+            return f"{self.pool.names[index.row()]}\n{seconds // 60:02d}:{seconds % 60:02d}"
+        if role == Qt.ToolTipRole:
+            phase = 'Break' if core.is_break else 'Work'
+            state = 'running' if core.is_active else 'paused' if core.is_running else 'idle'
+            return f"{phase}, {state}"
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        return None
+
+    def refresh(self):
+        # One dataChanged for the whole grid; the view only repaints the
+        # cells that are actually on screen.
+        if len(self.pool):
+            self.dataChanged.emit(self.index(0), self.index(len(self.pool) - 1), [Qt.DisplayRole])
+
+    def refresh_row(self, row):
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.ToolTipRole])
+
+
+class MultiTimerWindow(QWidget):
+    def __init__(self, names, work_duration=25 * 60, break_duration=5 * 60):
+        super().__init__()
+        self.setWindowTitle('Pomodoro Timers')
+        self.board = MultiTimerBoard(parent=self)
+        for name in names:
+            self.board.pool.add(name, work_duration, break_duration)
+        self.board.expired.connect(self.session_finished)
+        self.model = MultiTimerModel(self.board.pool, self)
+        self.alerts = None
+
+        self.view = QListView(self)
+        self.view.setModel(self.model)
+        self.view.setViewMode(QListView.IconMode)
+        self.view.setMovement(QListView.Static)
+        self.view.setResizeMode(QListView.Adjust)
+        self.view.setUniformItemSizes(True)
+        self.view.setGridSize(QSize(120, 60))
+        self.view.setStyleSheet("font-size: 16px; color: white; background-color: rgba(0, 0, 0, 0.8);")
+        self.view.activated.connect(lambda index: self.apply(index.row(), 'toggle'))
+        # Shortcuts are matched before the focused view sees the key, which
+        # would otherwise take Space for selection and letters for search.
+        for key, action in ((Qt.Key_Space, 'toggle'), (Qt.Key_B, 'toggle_break'), (Qt.Key_R, 'reset')):
+            QShortcut(QKeySequence(key), self, lambda action=action: self.apply_current(action))
+        QShortcut(QKeySequence(Qt.Key_Escape), self, self.close)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.setTimerType(Qt.CoarseTimer)
+        self.refresh_timer.timeout.connect(self.model.refresh)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.view)
+        self.setLayout(layout)
+        self.resize(800, 600)
+
+    def apply_current(self, action):
+        row = self.view.currentIndex().row()
+        if row >= 0:
+            self.apply(row, action)
+
+    def apply(self, row, action):
+        self.board.apply(row, action)
+        self.model.refresh_row(row)
+        self.update_refresh()
+
+    def update_refresh(self):
+        if self.board.pool.active_count() and self.isVisible():
+            if not self.refresh_timer.isActive():
+                self.refresh_timer.start()
+        else:
+            self.refresh_timer.stop()
+
+    def session_finished(self, row):
+        self.model.refresh_row(row)
+        self.update_refresh()
+        if self.alerts is None:
+            from alerts import AlertPlayer
+            self.alerts = AlertPlayer(self)
+            self.alerts.load('complete', os.path.join(ICON_PATH, "complete.wav"))
+        self.alerts.play('complete')
+
+    def showEvent(self, event):
+        self.model.refresh()
+        self.update_refresh()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.update_refresh()
+        super().hideEvent(event)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run several pomodoro timers in one window')
+    parser.add_argument('names', nargs='*', help='one timer per name')
+    parser.add_argument('--count', type=int, default=0, help='add this many numbered timers')
+    parser.add_argument('--work', type=int, default=25, help='work minutes')
+    parser.add_argument('--break', dest='break_minutes', type=int, default=5, help='break minutes')
+    args = parser.parse_args(argv)
+
+    names = args.names + [f'Timer {number}' for number in range(1, args.count + 1)]
+    app = QApplication(sys.argv[:1])
+    window = MultiTimerWindow(names or ['Timer 1'], args.work * 60, args.break_minutes * 60)
+    window.show()
+    return app.exec_()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,13 +1,27 @@
 #!/usr/bin/env python3
 import sys
 import os
-from PyQt5.QtCore import Qt, QTimer, QTime, QPoint, QUrl, QSize, QSettings, QCoreApplication
-from PyQt5.QtGui import QIcon, QColor, QPalette
-from PyQt5.QtWidgets import QApplication, QLabel, QVBoxLayout, QWidget, QPushButton, QMenu, QAction, QSpinBox, QHBoxLayout, QSizeGrip, QInputDialog, QListWidget, QListWidgetItem, QDialog, QPlainTextEdit, QLineEdit, QDialogButtonBox, QColorDialog, QSlider, QStyle
-from PyQt5.QtMultimedia import QSoundEffect
-
-# Ensure you have a directory named "icons" in your project with the required icon files.
-ICON_PATH = os.path.join(os.path.dirname(__file__), 'res')
+import time
+from startup_profile import profiler  # first, so the profile covers the Qt imports
+from PyQt5.QtCore import Qt, QEvent, QTime, QPoint, QTimer, QSize, QCoreApplication
+from PyQt5.QtGui import QColor, QKeySequence, QPalette, QTextCursor
+from PyQt5.QtWidgets import QApplication, QLabel, QVBoxLayout, QWidget, QPushButton, QMenu, QAction, QSpinBox, QHBoxLayout, QSizeGrip, QInputDialog, QListView, QDialog, QPlainTextEdit, QLineEdit, QDialogButtonBox, QColorDialog, QSlider, QStyle, QFileDialog, QMessageBox
+
+from checkpoint import Checkpoint, ACTIVE, IDLE
+from history import SessionHistory
+from instrumentation import metrics
+from resources import ICON_PATH, data_path, icons
+from settings_store import SettingsStore
+from task_io import TaskDiffThread, TaskExportThread, TaskImportThread, TaskIndexThread
+from task_model import TaskListModel
+from task_repository import TaskRepository
+from task_store import TaskStore
+from theme import Theme
+from timer_core import PomodoroCore, Session
+from timer_display import TimerDisplay
+from timer_engine import DeadlineTimer
+
+profiler.mark('imports')
 
 
 class AddTaskDialog(QDialog):
@@ -37,66 +51,95 @@ class AddTaskDialog(QDialog):
         return self.task_input.text()
 
 class PomodoroTimer(QWidget):
+    EDIT_PAGE_SIZE = 1000  # task editor lines appended per event-loop turn
+
     def __init__(self):
         super().__init__()
         self.is_paused = False
-        self.is_break = False
-        self.is_running = False  # Add this attribute to track if the timer has started
         self.start_time = QTime(0, 25, 0)
         self.break_time = QTime(0, 5, 0)
         self.time_left = self.start_time
-        self.sound_effect = QSoundEffect()
-        self.sound_effect.setSource(QUrl.fromLocalFile(os.path.join(ICON_PATH, "complete.wav")))
-        self.tasks = []
+        self.core = PomodoroCore(QTime(0, 0).secsTo(self.start_time), QTime(0, 0).secsTo(self.break_time))
+        self.core.session_listeners.append(self.record_session)
+        self.history = SessionHistory(data_path('history.sqlite3'))
+        self.checkpoint = Checkpoint(data_path('checkpoint.bin'))
+        self.session_task = (None, None)
+        self.alerts = None  # QtMultimedia is loaded after the first paint
+        self.control = None
+        self.out_of_sight = False  # hidden, minimized or fully covered
+        self.io_threads = set()
+        self.index_thread = None
+        self.edit_thread = None  # writes the task editor's changes; other task writes wait for it
+        self.deferred_batches = []
+        self.settings = SettingsStore(parent=self)
+        self.theme = Theme()
+        self.task_store = TaskStore(TaskRepository(data_path('tasks.sqlite3')))
         self.completed_tasks = 0
         self.initUI()  # Initialize UI components first
         self.initTimer()
-        self.load_tasks()  # Load tasks after initializing UI components
+        profiler.mark('widget build')
         self.load_ui_config()  # Load UI configuration after initializing UI components
+        self.restore_checkpoint()
+        profiler.mark('settings load')
+        metrics.gauge('settings', self.settings.stats)
+        metrics.gauge('timer', lambda: {'wakeups': self.timer.wakeups, 'low_power': self.timer.low_power})
+        metrics.gauge('display', self.timer_label.stats)
+        metrics.gauge('theme', lambda: self.theme.stats())  # load_ui_config() may swap the theme
+        metrics.gauge('alerts', lambda: self.alerts.stats() if self.alerts is not None else None)
 
     def initUI(self):
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.X11BypassWindowManagerHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
 
-        self.timer_label = QLabel(self.time_left.toString('mm:ss'), self)
-        self.timer_label.setAlignment(Qt.AlignCenter)
-        self.timer_label.setStyleSheet("font-size: 30px; color: white; background-color: rgba(0, 0, 0, 0.5); padding: 10px; border-radius: 10px;")
+        self.timer_label = TimerDisplay(self.time_left.toString('mm:ss'), self)
+        self.timer_label.setObjectName('timerLabel')
 
         self.play_pause_button = QPushButton(self)
-        self.play_pause_button.setIcon(QIcon(os.path.join(ICON_PATH, "start.svg")))
+        self.play_pause_button.setIcon(icons.icon("start.svg"))
         self.play_pause_button.clicked.connect(self.toggle_timer)
-        self.play_pause_button.setStyleSheet("background-color: rgba(0, 0, 0, 0.5); padding: 5px; border-radius: 5px;")
+        self.play_pause_button.setObjectName('controlButton')
 
         self.reset_button = QPushButton(self)
-        self.reset_button.setIcon(QIcon(os.path.join(ICON_PATH, "reset.svg")))
+        self.reset_button.setIcon(icons.icon("reset.svg"))
         self.reset_button.clicked.connect(self.reset_timer)
-        self.reset_button.setStyleSheet("background-color: rgba(0, 0, 0, 0.5); padding: 5px; border-radius: 5px;")
+        self.reset_button.setObjectName('controlButton')
 
         self.break_button = QPushButton(self)
-        self.break_button.setIcon(QIcon(os.path.join(ICON_PATH, "break.svg")))
+        self.break_button.setIcon(icons.icon("break.svg"))
         self.break_button.clicked.connect(self.toggle_break)
-        self.break_button.setStyleSheet("background-color: rgba(0, 0, 0, 0.5); padding: 5px; border-radius: 5px;")
+        self.break_button.setObjectName('controlButton')
 
         self.menu_button = QPushButton(self)
-        self.menu_button.setIcon(QIcon(os.path.join(ICON_PATH, "menu.svg")))
-        self.menu_button.setStyleSheet("background-color: rgba(0, 0, 0, 0.5); padding: 5px; border-radius: 5px;")
-        self.create_menu()
+        self.menu_button.setIcon(icons.icon("menu.svg"))
+        self.menu_button.setObjectName('controlButton')
+        # The menu is filled in the first time it is opened.
+        self.menu = QMenu()
+        self.menu.aboutToShow.connect(self.create_menu)
+        self.menu_button.setMenu(self.menu)
 
-        self.task_list = QListWidget(self)
-        self.task_list.setStyleSheet("background: transparent;")
-        self.task_list.setFrameStyle(QListWidget.NoFrame)
+        self.task_model = TaskListModel(self.task_store, self)
+        self.task_model.task_completed.connect(self.complete_task)
+        self.task_search = QLineEdit(self)
+        self.task_search.setObjectName('taskSearch')
+        self.task_search.setPlaceholderText('Search tasks')
+        self.task_search.setClearButtonEnabled(True)
+        self.task_search.textChanged.connect(self.search_tasks)
+        self.task_list = QListView(self)
+        self.task_list.setModel(self.task_model)
+        self.task_list.setUniformItemSizes(True)
+        self.task_list.setObjectName('taskList')
+        self.task_list.setFrameStyle(QListView.NoFrame)
         self.task_list.setAttribute(Qt.WA_TranslucentBackground)
         self.task_list.setPalette(QPalette(QColor(0, 0, 0, 0)))
-        self.task_list.itemChanged.connect(self.complete_task)
 
         self.completed_tasks_label = QLabel(f'Tasks Completed: {self.completed_tasks}', self)
         self.completed_tasks_label.setAlignment(Qt.AlignLeft)
-        self.completed_tasks_label.setStyleSheet("font-size: 14px; color: black; background: transparent; padding: 5px; border-radius: 5px;")
+        self.completed_tasks_label.setObjectName('completedTasksLabel')
 
         self.edit_task_button = QPushButton(self)
-        self.edit_task_button.setIcon(QIcon(os.path.join(ICON_PATH, "add_task.svg")))
+        self.edit_task_button.setIcon(icons.icon("add_task.svg"))
         self.edit_task_button.clicked.connect(self.edit_tasks)
-        self.edit_task_button.setStyleSheet("background-color: rgba(0, 0, 0, 0.5); padding: 5px; border-radius: 5px;")
+        self.edit_task_button.setObjectName('controlButton')
 
         self.size_grip = QSizeGrip(self)
 
@@ -108,6 +151,7 @@ class PomodoroTimer(QWidget):
         button_layout.addWidget(self.break_button)
         button_layout.addWidget(self.menu_button)
         layout.addLayout(button_layout)
+        layout.addWidget(self.task_search)
         layout.addWidget(self.task_list)
         bottom_layout = QHBoxLayout()
         bottom_layout.addWidget(self.completed_tasks_label)
@@ -116,47 +160,138 @@ class PomodoroTimer(QWidget):
         layout.addWidget(self.size_grip, 0, Qt.AlignBottom | Qt.AlignRight)
         self.setLayout(layout)
 
+    def finish_startup(self):
+        # Work that is not needed for the first frame.
+        self.load_tasks()  # Load tasks after initializing UI components
+        icon_size = self.style().pixelMetric(QStyle.PM_ButtonIconSize)
+        icons.preload([QSize(icon_size, icon_size)])
+        self.load_alerts()
+        self.start_control_server()
+
+    def load_alerts(self):
+        if self.alerts is None:
+            from alerts import AlertPlayer
+            self.alerts = AlertPlayer(self)
+            self.alerts.load('complete', self.settings.value('alertSound', os.path.join(ICON_PATH, "complete.wav")))
+        return self.alerts
+
+    def play_sound(self):
+        self.load_alerts().play('complete')
+
+    def warm_up_sound(self):
+        if self.alerts is not None:
+            self.alerts.warm_up('complete')
+
+    def start_control_server(self):
+        from control_server import ControlServer
+        self.control = ControlServer({
+            'status': lambda request: self.timer_state(),
+            'start': lambda request: self.run_command(self.start_timer),
+            'pause': lambda request: self.run_command(self.pause_timer),
+            'toggle': lambda request: self.run_command(self.toggle_timer),
+            'reset': lambda request: self.run_command(self.reset_timer),
+            'break': lambda request: self.run_command(self.toggle_break),
+            'add_tasks': self.add_tasks_command,
+            'metrics': lambda request: metrics.snapshot(),
+        }, self)
+        self.control.subscribers_changed.connect(lambda count: self.update_low_power())
+        if not self.control.listen():
+            print(f'Control socket unavailable: {self.control.error}', file=sys.stderr)
+
+    def run_command(self, action):
+        action()
+        return self.timer_state()
+
+    def add_tasks_command(self, request):
+        tasks = request['tasks']
+        if not isinstance(tasks, list) or not all(isinstance(task, str) for task in tasks):
+            raise ValueError('tasks must be a list of strings')
+        if self.edit_thread is not None:
+            raise RuntimeError('tasks are being saved; try again shortly')
+        self.task_model.add_tasks(tasks)
+        return {'added': len(tasks)}
+
+    def timer_state(self):
+        seconds = self.core.display_seconds()
+        return {
+            'phase': 'break' if self.is_break else 'work',
+            'running': self.is_running,
+            'active': self.core.is_active,
+            'remaining': round(self.core.remaining(), 3),
+            'display': f'{seconds // 60:02d}:{seconds % 60:02d}',
+        }
+
+    def on_transition(self, transition):
+        self.save_checkpoint()
+        if self.control is not None:
+            self.control.publish(dict(event='transition', transition=transition, **self.timer_state()))
+
     def create_menu(self):
-        self.menu = QMenu()
+        if self.menu.actions():
+            return
 
-        set_timer_action = QAction(QIcon(os.path.join(ICON_PATH, "timer.png")), 'Set Timer', self)
+        set_timer_action = QAction(icons.icon("timer.png"), 'Set Timer', self)
         set_timer_action.triggered.connect(self.show_set_timer_dialog)
         self.menu.addAction(set_timer_action)
 
-        set_break_action = QAction(QIcon(os.path.join(ICON_PATH, "break.svg")), 'Set Break', self)
+        set_break_action = QAction(icons.icon("break.svg"), 'Set Break', self)
         set_break_action.triggered.connect(self.show_set_break_dialog)
         self.menu.addAction(set_break_action)
 
-        add_task_action = QAction(QIcon(os.path.join(ICON_PATH, "add_task.svg")), 'Add Task', self)
+        add_task_action = QAction(icons.icon("add_task.svg"), 'Add Task', self)
         add_task_action.triggered.connect(self.add_task)
         self.menu.addAction(add_task_action)
 
-        edit_tasks_action = QAction(QIcon(os.path.join(ICON_PATH, "edit_tasks.svg")), 'Edit Tasks', self)
+        edit_tasks_action = QAction(icons.icon("edit_tasks.svg"), 'Edit Tasks', self)
         edit_tasks_action.triggered.connect(self.edit_tasks)
         self.menu.addAction(edit_tasks_action)
 
-        change_color_action = QAction(QIcon(os.path.join(ICON_PATH, "change_color.svg")), 'Change Background Color', self)
+        import_tasks_action = QAction(icons.icon("add_task.svg"), 'Import Tasks', self)
+        import_tasks_action.triggered.connect(self.import_tasks)
+        self.menu.addAction(import_tasks_action)
+
+        export_tasks_action = QAction(icons.icon("edit_tasks.svg"), 'Export Tasks', self)
+        export_tasks_action.triggered.connect(self.export_tasks)
+        self.menu.addAction(export_tasks_action)
+
+        change_color_action = QAction(icons.icon("change_color.svg"), 'Change Background Color', self)
         change_color_action.triggered.connect(self.change_color)
         self.menu.addAction(change_color_action)
 
-        change_font_color_action = QAction(QIcon(os.path.join(ICON_PATH, "change_color.svg")), 'Change Font Color', self)
+        change_font_color_action = QAction(icons.icon("change_color.svg"), 'Change Font Color', self)
         change_font_color_action.triggered.connect(self.change_font_color)
         self.menu.addAction(change_font_color_action)
 
-        change_opacity_action = QAction(QIcon(os.path.join(ICON_PATH, "change_opacity.svg")), 'Change Opacity', self)
+        change_opacity_action = QAction(icons.icon("change_opacity.svg"), 'Change Opacity', self)
         change_opacity_action.triggered.connect(self.change_opacity)
         self.menu.addAction(change_opacity_action)
 
-        exit_action = QAction(QIcon(os.path.join(ICON_PATH, "exit.svg")), 'Exit', self)
+        exit_action = QAction(icons.icon("exit.svg"), 'Exit', self)
         exit_action.triggered.connect(self.close)
         self.menu.addAction(exit_action)
 
-        self.menu_button.setMenu(self.menu)
+    @property
+    def is_break(self):
+        return self.core.is_break
+
+    @property
+    def is_running(self):
+        return self.core.is_running
 
-        self.menu_button.setMenu(self.menu)
     def initTimer(self):
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_timer)
+        self.timer = DeadlineTimer(self.core, self)
+        self.timer.tick.connect(self.update_timer)
+        self.timer.expired.connect(self.finish_session)
+        self.timer.warning.connect(self.warm_up_sound)
+        self.timer_label.exposedChanged.connect(lambda exposed: self.update_low_power(not exposed))
+
+    def update_low_power(self, out_of_sight=None):
+        # Socket subscribers such as status bars still want a tick every
+        # second while the window is out of sight.
+        if out_of_sight is not None:
+            self.out_of_sight = out_of_sight
+        subscribed = self.control is not None and bool(self.control.subscribers)
+        self.timer.set_low_power(self.out_of_sight and not subscribed)
 
     def toggle_timer(self):
         if self.timer.isActive():
@@ -166,45 +301,85 @@ class PomodoroTimer(QWidget):
 
     def start_timer(self):
         if not self.is_running:
-            self.time_left = self.start_time if not self.is_break else self.break_time
-            self.is_running = True
-        self.timer.start(1000)
-        self.play_pause_button.setIcon(QIcon(os.path.join(ICON_PATH, "pause.svg")))
+            self.session_task = self.current_task()
+        self.core.start()
+        self.timer.sync()
+        self.play_pause_button.setIcon(icons.icon("pause.svg"))
+        self.on_transition('start')
 
     def toggle_break(self):
-        if self.is_break:
-            self.time_left = self.start_time
-        else:
-            self.time_left = self.break_time
-
-        self.is_break = not self.is_break
-        self.timer_label.setText(self.time_left.toString('mm:ss'))
-        self.sound_effect.play()
-        if not self.timer.isActive():
-            self.timer.start(1000)
-            self.play_pause_button.setIcon(QIcon(os.path.join(ICON_PATH, "pause.svg")))
+        self.core.toggle_break()
+        self.session_task = self.current_task()
+        self.timer.sync()
+        self.play_sound()
+        self.play_pause_button.setIcon(icons.icon("pause.svg"))
+        self.on_transition('break')
 
     def pause_timer(self):
-        self.timer.stop()
-        self.play_pause_button.setIcon(QIcon(os.path.join(ICON_PATH, "start.svg")))
+        self.core.pause()
+        self.timer.sync()
+        self.play_pause_button.setIcon(icons.icon("start.svg"))
+        self.on_transition('pause')
 
     def reset_timer(self):
-        self.timer.stop()
-        self.play_pause_button.setIcon(QIcon(os.path.join(ICON_PATH, "start.svg")))
-        self.is_running = False  # Reset running state
-        self.time_left = self.start_time if not self.is_break else self.break_time
-        self.timer_label.setText(self.time_left.toString('mm:ss'))
+        self.core.reset()
+        self.timer.sync()
+        self.play_pause_button.setIcon(icons.icon("start.svg"))
+        self.on_transition('reset')
 
-    def update_timer(self):
-        self.time_left = self.time_left.addSecs(-1)
+    def update_timer(self, seconds):
+        self.time_left = QTime(0, 0).addSecs(seconds)
         self.timer_label.setText(self.time_left.toString('mm:ss'))
-
-        if self.time_left == QTime(0, 0, 0):
-            self.timer.stop()
-            self.play_pause_button.setIcon(QIcon(os.path.join(ICON_PATH, "start.svg")))
-            self.sound_effect.play()
-            self.time_left = self.start_time if not self.is_break else self.break_time
-            self.is_running = False  # Reset running state
+        if self.control is not None:
+            self.control.publish({'event': 'tick', 'seconds': seconds, 'display': self.time_left.toString('mm:ss')})
+
+    def finish_session(self):
+        self.play_pause_button.setIcon(icons.icon("start.svg"))
+        self.play_sound()
+        self.on_transition('finish')
+
+    def save_checkpoint(self):
+        self.checkpoint.save(self.core, self.session_task[0])
+
+    def restore_checkpoint(self):
+        state = self.checkpoint.load()
+        if state is None or state['state'] == IDLE:
+            return
+        active = state['state'] == ACTIVE
+        if active and state['deadline'] <= time.time():
+            # The session ran out while the app was not running: credit it
+            # to the history and come back idle in the same phase.
+            session = Session(
+                'break' if state['is_break'] else 'work',
+                state['started_at'] or state['deadline'] - state['duration'],
+                state['deadline'],
+                state['duration'],
+                True,
+                state['interruptions'],
+            )
+            self.history.record(session, state['task_id'] if not state['is_break'] else None)
+            self.core.completed_sessions += 1
+            self.core.is_break = state['is_break']
+            self.core.reset()
+            self.save_checkpoint()
+        else:
+            remaining = state['deadline'] - time.time() if active else state['remaining']
+            self.core.restore(state['is_break'], state['duration'], remaining, active,
+                              state['started_at'], state['interruptions'])
+            self.session_task = (state['task_id'], None)
+            if active:
+                self.play_pause_button.setIcon(icons.icon("pause.svg"))
+        self.timer.sync()
+
+    def current_task(self):
+        if not len(self.task_store):
+            return (None, None)
+        task_id = self.task_store.id_at(0)
+        return (task_id, self.task_store.text(task_id))
+
+    def record_session(self, session):
+        task_id, task = self.session_task if session.kind == 'work' else (None, None)
+        self.history.record(session, task_id, task)
 
     def show_set_timer_dialog(self):
         self.timer_dialog = QWidget()
@@ -229,8 +404,9 @@ class PomodoroTimer(QWidget):
     def set_timer(self):
         minutes = self.minutes_spinbox.value()
         self.start_time = QTime(0, minutes, 0)
-        self.time_left = self.start_time
-        self.timer_label.setText(self.time_left.toString('mm:ss'))
+        self.core.set_durations(work_duration=minutes * 60)
+        self.timer.sync()
+        self.save_checkpoint()
         self.timer_dialog.close()
         self.save_ui_config()
 
@@ -257,6 +433,9 @@ class PomodoroTimer(QWidget):
     def set_break(self):
         minutes = self.break_spinbox.value()
         self.break_time = QTime(0, minutes, 0)
+        self.core.set_durations(break_duration=minutes * 60)
+        self.timer.sync()
+        self.save_checkpoint()
         self.break_dialog.close()
         self.save_ui_config()
 
@@ -265,92 +444,165 @@ class PomodoroTimer(QWidget):
         if dialog.exec_() == QDialog.Accepted:
             text = dialog.getTask()
             if text:
-                self.tasks.append(text)
-                self.save_tasks()
-                self.update_task_list()
+                self.task_model.add_task(text)
 
     def edit_tasks(self):
         dialog = QDialog(self)
         dialog.setWindowTitle('Edit Tasks')
         layout = QVBoxLayout()
 
-        self.edit_task_text = QPlainTextEdit('\n'.join(self.tasks))
+        self.edit_task_rows = []
+        self.edit_task_text = QPlainTextEdit()
+        self.edit_task_text.setReadOnly(True)
         save_button = QPushButton('Save')
-        save_button.clicked.connect(lambda: self.save_edited_tasks(dialog))
+        save_button.setEnabled(False)
+        save_button.clicked.connect(lambda: self.save_edited_tasks(dialog, save_button))
+        # The text is filled a page per event-loop turn, so opening a large
+        # backlog does not stall the countdown; editing starts once it is all in.
+        loader = QTimer(dialog)
+        loader.timeout.connect(lambda: self.load_edited_tasks(loader, save_button))
+        loader.start(0)
 
         layout.addWidget(self.edit_task_text)
         layout.addWidget(save_button)
         dialog.setLayout(layout)
         dialog.setGeometry(QStyle.alignedRect(Qt.LeftToRight, Qt.AlignCenter, dialog.sizeHint(), app.desktop().availableGeometry()))
         dialog.exec_()
-
-    def save_edited_tasks(self, dialog):
-        self.tasks = self.edit_task_text.toPlainText().split('\n')
-        self.update_task_list()
-        self.save_tasks()
-        dialog.accept()
-
-    def update_task_list(self):
-        self.task_list.clear()
-        for index, task in enumerate(self.tasks, start=1):
-            item = QListWidgetItem(f"{index}. {task}")
-            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-            item.setCheckState(Qt.Unchecked)
-            self.task_list.addItem(item)
-
-    def complete_task(self, item):
-        if item.checkState() == Qt.Checked:
-            task_text = item.text().split('. ', 1)[1]  # Get the task text without the number
-            self.tasks.remove(task_text)
-            self.completed_tasks += 1
-            self.completed_tasks_label.setText(f'Tasks Completed: {self.completed_tasks}')
-            self.sound_effect.play()
-            self.update_task_list()
-            self.save_tasks()
-
-    def save_tasks(self):
-        settings = QSettings('PomodoroApp', 'PomodoroTimer')
-        settings.setValue('tasks', self.tasks)
-
+        loader.stop()
+
+    def load_edited_tasks(self, loader, save_button):
+        position = self.edit_task_rows[-1][1] if self.edit_task_rows else None
+        rows = self.task_store.repository.page(position, self.EDIT_PAGE_SIZE)
+        if rows:
+            self.edit_task_text.appendPlainText('\n'.join(row[2] for row in rows))
+            self.edit_task_rows.extend(rows)
+        if len(rows) < self.EDIT_PAGE_SIZE:
+            loader.stop()
+            self.edit_task_text.moveCursor(QTextCursor.Start)
+            self.edit_task_text.setReadOnly(False)
+            save_button.setEnabled(True)
+
+    def save_edited_tasks(self, dialog, save_button):
+        # Diff the edited text against the stored rows on a worker thread so
+        # a huge paste does not stall the countdown, then write only the
+        # lines that changed.
+        save_button.setEnabled(False)
+        texts = self.edit_task_text.toPlainText().split('\n')
+        thread = TaskDiffThread(self.task_store.repository.path, self.edit_task_rows, texts, self)
+        thread.failed.connect(lambda error: QMessageBox.warning(self, 'Edit Tasks', error))
+        thread.finished.connect(lambda: self.finish_edited_tasks(thread, dialog, save_button))
+        self.edit_thread = thread
+        self.start_io_thread(thread)
+
+    def finish_edited_tasks(self, thread, dialog, save_button):
+        self.edit_thread = None
+        if thread.edits is None:
+            # The save failed; keep the dialog and the user's text so they
+            # can try again.
+            save_button.setEnabled(True)
+        else:
+            self.reload_tasks()
+            dialog.accept()
+        deferred, self.deferred_batches = self.deferred_batches, []
+        for import_thread, batch in deferred:
+            self.import_batch(import_thread, batch)
+
+    def import_tasks(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Import Tasks', '', 'Task files (*.txt *.csv *.jsonl);;All files (*)')
+        if path:
+            thread = TaskImportThread(path, self)
+            thread.batch_ready.connect(lambda batch: self.import_batch(thread, batch))
+            thread.failed.connect(lambda error: QMessageBox.warning(self, 'Import Tasks', error))
+            self.start_io_thread(thread)
+
+    def import_batch(self, thread, batch):
+        if self.edit_thread is not None:
+            # Batches still arrive under the editor's modal loop; writing
+            # them now would wait on the save's write lock.
+            self.deferred_batches.append((thread, batch))
+            return
+        self.task_model.add_tasks(batch)
+        thread.batch_done()
+
+    def export_tasks(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Export Tasks', 'tasks.txt', 'Text (*.txt);;CSV (*.csv);;JSON Lines (*.jsonl)')
+        if path:
+            thread = TaskExportThread(self.task_store.repository.path, path, self)
+            thread.failed.connect(lambda error: QMessageBox.warning(self, 'Export Tasks', error))
+            self.start_io_thread(thread)
+
+    def start_io_thread(self, thread):
+        self.io_threads.add(thread)
+        thread.finished.connect(lambda: self.io_threads.discard(thread))
+        thread.start()
+
+    def complete_task(self, task_id, text):
+        self.completed_tasks += 1
+        self.completed_tasks_label.setText(f'Tasks Completed: {self.completed_tasks}')
+        self.play_sound()
+
+    @metrics.timed('load_tasks')
     def load_tasks(self):
-        settings = QSettings('PomodoroApp', 'PomodoroTimer')
-        self.tasks = settings.value('tasks', [])
-        if self.tasks is None:
-            self.tasks = []
-        self.update_task_list()
+        settings = self.settings
+        # Older versions kept the whole list in a single QSettings value;
+        # move it into the task database once and drop the blob.
+        if settings.contains('tasks'):
+            if self.task_store.repository.is_empty():
+                self.task_store.repository.add_many(settings.value('tasks', [], type=list) or [])
+            settings.remove('tasks')
+        self.reload_tasks()
+
+    def reload_tasks(self):
+        self.task_model.reload()
+        if self.task_search.text():
+            self.build_task_index()
+
+    def search_tasks(self, query):
+        if self.task_store.index is None and self.index_thread is None and query.strip():
+            self.build_task_index()
+        self.task_model.set_filter(query)
+
+    def build_task_index(self):
+        # The index is built from its own connection on a worker thread; the
+        # list stays unfiltered until it arrives.
+        if self.index_thread is not None:
+            self.index_thread.requestInterruption()
+        self.task_store.begin_index()
+        thread = TaskIndexThread(self.task_store.repository.path, self)
+        thread.built.connect(self.attach_task_index)
+        self.index_thread = thread
+        self.start_io_thread(thread)
+
+    def attach_task_index(self, index):
+        if self.sender() is not self.index_thread:
+            return
+        self.index_thread = None
+        if self.task_store.attach_index(index):
+            self.task_model.refresh_filter()
 
     def change_font_color(self):
-        current_color = self.timer_label.palette().color(QPalette.WindowText)
-        color = QColorDialog.getColor(current_color, self, "Choose Font Color")
+        color = QColorDialog.getColor(self.theme.font_color, self, "Choose Font Color")
         if color.isValid():
-            font_color = color.name()
-            self.set_font_color(font_color)
+            self.set_font_color(color)
             self.save_ui_config()
 
+    @metrics.timed('set_font_color')
     def set_font_color(self, color):
-        background_color = self.timer_label.styleSheet().split("background-color: rgba(")[-1].split(");")[0]
-        self.timer_label.setStyleSheet(f"font-size: 30px; color: {color}; background-color: rgba({background_color}); padding: 10px; border-radius: 10px;")
-        self.completed_tasks_label.setStyleSheet(f"font-size: 14px; color: {color}; background: transparent; padding: 5px; border-radius: 5px;")
-        for i in range(self.task_list.count()):
-            item = self.task_list.item(i)
-            item.setForeground(QColor(color))
+        self.theme.set_font_color(color)
+        self.apply_theme()
 
     def change_color(self):
-        current_color = QColor(0, 0, 0, int(0.5 * 255))
-        color = QColorDialog.getColor(current_color, self, "Choose Background Color")
+        color = QColorDialog.getColor(self.theme.background, self, "Choose Background Color")
         if color.isValid():
-            rgba = color.getRgb()
-            background_color = f"background-color: rgba({rgba[0]}, {rgba[1]}, {rgba[2]}, {rgba[3]/255});"
-            font_color = self.timer_label.palette().color(QPalette.WindowText).name()
-            self.timer_label.setStyleSheet(f"font-size: 30px; color: {font_color}; {background_color} padding: 10px; border-radius: 10px;")
-            self.play_pause_button.setStyleSheet(f"{background_color} padding: 5px; border-radius: 5px;")
-            self.reset_button.setStyleSheet(f"{background_color} padding: 5px; border-radius: 5px;")
-            self.break_button.setStyleSheet(f"{background_color} padding: 5px; border-radius: 5px;")
-            self.menu_button.setStyleSheet(f"{background_color} padding: 5px; border-radius: 5px;")
-            self.edit_task_button.setStyleSheet(f"{background_color} padding: 5px; border-radius: 5px;")
-            #self.completed_tasks_label.setStyleSheet(f"font-size: 14px; color: {font_color}; {background_color} padding: 5px; border-radius: 5px;")
+            self.theme.set_background(color)
+            self.apply_theme()
             self.save_ui_config()
 
+    @metrics.timed('apply_theme')
+    def apply_theme(self):
+        self.theme.apply(self)
+        self.task_model.set_foreground(self.theme.font_color)
+
     def change_opacity(self):
         dialog = QDialog(self)
         dialog.setWindowTitle('Change Opacity')
@@ -368,42 +620,31 @@ class PomodoroTimer(QWidget):
         dialog.exec_()
 
     def set_opacity(self, value):
-        opacity = value / 100
-        self.setWindowOpacity(opacity)
+        self.theme.opacity = value / 100
+        self.setWindowOpacity(self.theme.opacity)
         self.save_ui_config()
 
+    @metrics.timed('save_ui_config')
     def save_ui_config(self):
-        settings = QSettings('PomodoroApp', 'PomodoroTimer')
-        settings.setValue('windowOpacity', self.windowOpacity())
-        color_styles = self.timer_label.styleSheet().split("background-color: rgba(")[-1].split(");")[0]
-        settings.setValue('backgroundColor', color_styles)
-        settings.setValue('fontColor', self.timer_label.palette().color(QPalette.WindowText).name())
-        settings.setValue('geometry', self.saveGeometry())
-        settings.setValue('startTime', self.start_time.toString())
-        settings.setValue('breakTime', self.break_time.toString())
+        settings = self.settings
+        self.theme.save(settings)
+        settings.set('geometry', self.saveGeometry())
+        settings.set('startTime', self.start_time.toString())
+        settings.set('breakTime', self.break_time.toString())
 
     def load_ui_config(self):
-        settings = QSettings('PomodoroApp', 'PomodoroTimer')
-        opacity = settings.value('windowOpacity', 0.5, type=float)
-        self.setWindowOpacity(opacity)
-        background_color = settings.value('backgroundColor', "0, 0, 0, 0.5")
-        font_color = settings.value('fontColor', "#FFFFFF")  # Default to white if not set
-        self.timer_label.setStyleSheet(f"font-size: 30px; color: {font_color}; background-color: rgba({background_color}); padding: 10px; border-radius: 10px;")
-        self.play_pause_button.setStyleSheet(f"background-color: rgba({background_color}); padding: 5px; border-radius: 5px;")
-        self.reset_button.setStyleSheet(f"background-color: rgba({background_color}); padding: 5px; border-radius: 5px;")
-        self.break_button.setStyleSheet(f"background-color: rgba({background_color}); padding: 5px; border-radius: 5px;")
-        self.menu_button.setStyleSheet(f"background-color: rgba({background_color}); padding: 5px; border-radius: 5px;")
-        self.edit_task_button.setStyleSheet(f"background-color: rgba({background_color}); padding: 5px; border-radius: 5px;")
-        self.completed_tasks_label.setStyleSheet(f"font-size: 14px; color: {font_color}; background: transparent; padding: 5px; border-radius: 5px;")
+        settings = self.settings
+        self.theme = Theme.from_settings(settings)
+        self.setWindowOpacity(self.theme.opacity)
+        self.apply_theme()
         if settings.contains('geometry'):
             self.restoreGeometry(settings.value('geometry'))
         if settings.contains('startTime'):
             self.start_time = QTime.fromString(settings.value('startTime'))
-            self.time_left = self.start_time
-            self.timer_label.setText(self.time_left.toString('mm:ss'))
         if settings.contains('breakTime'):
             self.break_time = QTime.fromString(settings.value('breakTime'))
-        self.set_font_color(font_color)
+        self.core.set_durations(QTime(0, 0).secsTo(self.start_time), QTime(0, 0).secsTo(self.break_time))
+        self.timer.sync()
 
 
     def mousePressEvent(self, event):
@@ -425,13 +666,54 @@ class PomodoroTimer(QWidget):
         self.save_ui_config()
         super().resizeEvent(event)
 
+    def showEvent(self, event):
+        self.update_low_power(False)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.update_low_power(True)
+        super().hideEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            self.update_low_power(self.isMinimized())
+        super().changeEvent(event)
+
+    def closeEvent(self, event):
+        for thread in list(self.io_threads):
+            thread.requestInterruption()
+            thread.wait()
+        self.settings.flush()
+        if self.control is not None:
+            self.control.close()
+        super().closeEvent(event)
+
     def keyPressEvent(self, event):
-        if event.key() == Qt.Key_Escape:
-            self.close()
+        if event.matches(QKeySequence.Find):
+            self.task_search.setFocus()
+            self.task_search.selectAll()
+        elif event.key() == Qt.Key_Escape:
+            if self.task_search.text():
+                self.task_search.clear()
+            else:
+                self.close()
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
+    profiler.mark('application')
+    if '--metrics' in sys.argv or os.environ.get('POMODORO_METRICS'):
+        metrics.enable(data_path('metrics.log'))
     timer = PomodoroTimer()
+    if '--profile-startup' in sys.argv:
+        def report_startup():
+            timer.finish_startup()
+            profiler.mark('deferred load')
+            print(profiler.report(), flush=True)
+            app.quit()
+        profiler.watch_first_paint(timer, lambda: QTimer.singleShot(0, report_startup))
+    else:
+        profiler.watch_first_paint(timer, lambda: QTimer.singleShot(0, timer.finish_startup))
     timer.show()
+    profiler.mark('show')
     sys.exit(app.exec_())
 
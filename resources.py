@@ -0,0 +1,46 @@
+import os
+
+from PyQt5.QtCore import QStandardPaths
+from PyQt5.QtGui import QIcon
+
+# Ensure you have a directory named "res" in your project with the required icon files.
+ICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'res')
+ICON_EXTENSIONS = ('.svg', '.png')
+
+
+def data_path(name):
+    base = QStandardPaths.writableLocation(QStandardPaths.GenericDataLocation)
+    return os.path.join(base, 'PomodoroApp', name)
+
+
+class IconRegistry:
+    def __init__(self, path=ICON_PATH):
+        self.path = path
+        self._icons = {}
+        self.loads = 0  # QIcon objects created; stays flat once everything is cached
+        self.hits = 0
+
+    def icon(self, name):
+        icon = self._icons.get(name)
+        if icon is None:
+            icon = QIcon(os.path.join(self.path, name))
+            self._icons[name] = icon
+            self.loads += 1
+        else:
+            self.hits += 1
+        return icon
+
+    def preload(self, sizes=()):
+        # Load every icon in the resource directory once and optionally render
+        # the pixmaps up front so the first paint does not parse any SVG.
+        for name in sorted(os.listdir(self.path)):
+            if name.endswith(ICON_EXTENSIONS) and name not in self._icons:
+                icon = self.icon(name)
+                for size in sizes:
+                    icon.pixmap(size)
+
+    def stats(self):
+        return {'loaded': len(self._icons), 'loads': self.loads, 'hits': self.hits}
+
+
+icons = IconRegistry()
@@ -0,0 +1,80 @@
+import time
+
+from PyQt5.QtCore import QObject, QTimer, QSettings, QCoreApplication
+
+from instrumentation import metrics
+
+
+class SettingsStore(QObject):
+    DEBOUNCE_MS = 500
+    MAX_DELAY_MS = 5000
+
+    def __init__(self, settings=None, parent=None):
+        super().__init__(parent)
+        self.settings = settings if settings is not None else QSettings('PomodoroApp', 'PomodoroTimer')
+        self._pending = {}
+        self._dirty_since = None
+        self.requests = 0  # set() calls, including ones coalesced away
+        self.writes = 0  # keys actually written to QSettings
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+
+    def value(self, key, default=None, type=None):
+        if key in self._pending:
+            return self._pending[key]
+        if type is None:
+            return self.settings.value(key, default)
+        return self.settings.value(key, default, type=type)
+
+    def contains(self, key):
+        return key in self._pending or self.settings.contains(key)
+
+    def set(self, key, value):
+        self.requests += 1
+        if key not in self._pending and self.settings.contains(key) and self.settings.value(key) == value:
+            return
+        self._pending[key] = value
+        now = time.monotonic()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        # Keep pushing the flush back while a burst continues, but never let
+        # a long drag hold changes in memory for more than MAX_DELAY_MS.
+        waited_ms = (now - self._dirty_since) * 1000
+        self._timer.start(int(max(0, min(self.DEBOUNCE_MS, self.MAX_DELAY_MS - waited_ms))))
+
+    def remove(self, key):
+        self._pending.pop(key, None)
+        self.settings.remove(key)
+
+    @metrics.timed('settings_flush')
+    def flush(self):
+        self._timer.stop()
+        if not self._pending:
+            return
+        started = time.perf_counter()
+        for key, value in self._pending.items():
+            self.settings.setValue(key, value)
+        self.writes += len(self._pending)
+        self._pending.clear()
+        self._dirty_since = None
+        self.settings.sync()
+        self.flushes += 1
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+        self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'writes': self.writes,
+            'flushes': self.flushes,
+            'pending': len(self._pending),
+            'last_flush_ms': self.last_flush_ms,
+            'max_flush_ms': self.max_flush_ms,
+        }
@@ -0,0 +1,42 @@
+import time
+
+# Taken before Qt is imported so the library load counts towards startup.
+STARTED = time.perf_counter()
+
+from PyQt5.QtCore import QObject, QEvent  # noqa: E402
+
+
+class StartupProfiler(QObject):
+    def __init__(self):
+        super().__init__()
+        self.started = STARTED
+        self.last = self.started
+        self.phases = []
+        self._on_first_paint = None
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def watch_first_paint(self, widget, callback):
+        self._on_first_paint = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and self._on_first_paint is not None:
+            obj.removeEventFilter(self)
+            callback, self._on_first_paint = self._on_first_paint, None
+            self.mark('first paint')
+            callback()
+        return False
+
+    def report(self):
+        lines = ['Startup profile:']
+        for phase, elapsed in self.phases:
+            lines.append(f'  {phase:20} {elapsed:8.1f} ms')
+        lines.append(f"  {'total':20} {(self.last - self.started) * 1000:8.1f} ms")
+        return '\n'.join(lines)
+
+
+profiler = StartupProfiler()
@@ -0,0 +1,277 @@
+import bisect
+import csv
+import json
+import os
+import sqlite3
+from collections import Counter
+
+from PyQt5.QtCore import QSemaphore, QThread, pyqtSignal
+
+from task_repository import TaskRepository
+from task_search import TaskIndex
+
+
+BATCH_SIZE = 1000
+TEXT_COLUMNS = ('task', 'text', 'title')
+
+
+def file_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    return 'text'
+
+
+def _read_text(file):
+    for line in file:
+        yield line.rstrip('\r\n')
+
+
+def _read_csv(file):
+    rows = csv.reader(file)
+    column = 0
+    for number, row in enumerate(rows):
+        if number == 0:
+            header = [cell.strip().lower() for cell in row]
+            matches = [header.index(name) for name in TEXT_COLUMNS if name in header]
+            if matches:
+                column = matches[0]
+                continue
+        if len(row) > column:
+            yield row[column]
+
+
+def _read_jsonl(file):
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if isinstance(record, dict):
+            record = next((record[name] for name in TEXT_COLUMNS if name in record), None)
+        if isinstance(record, str):
+            yield record
+
+
+READERS = {'text': _read_text, 'csv': _read_csv, 'jsonl': _read_jsonl}
+
+
+def read_task_batches(path, batch_size=BATCH_SIZE):
+    # Yields lists of task texts so callers never hold the whole file.
+    with open(path, encoding='utf-8', newline='') as file:
+        batch = []
+        for text in READERS[file_format(path)](file):
+            text = text.strip()
+            if not text:
+                continue
+            batch.append(text)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def write_tasks(path, batches):
+    kind = file_format(path)
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file) if kind == 'csv' else None
+        if writer is not None:
+            writer.writerow(['task'])
+        for batch in batches:
+            if writer is not None:
+                writer.writerows([text] for text in batch)
+            elif kind == 'jsonl':
+                file.writelines(json.dumps({'text': text}) + '\n' for text in batch)
+            else:
+                file.writelines(text + '\n' for text in batch)
+            count += len(batch)
+    return count
+
+
+def _unique_anchors(old, new):
+    # Pairs (i, j) of lines that occur exactly once in old and once in new,
+    # reduced to the longest run that is in order on both sides (patience
+    # diff). Everything else is matched between consecutive anchors.
+    old_counts = Counter(old)
+    new_counts = Counter(new)
+    new_index = {line: j for j, line in enumerate(new) if new_counts[line] == 1}
+    pairs = [(i, new_index[line]) for i, line in enumerate(old) if old_counts[line] == 1 and line in new_index]
+    tails = []  # tails[k]: index into pairs ending the best run of length k + 1
+    tail_lines = []  # new-side line of each tail, for bisect
+    previous = [None] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        length = bisect.bisect_left(tail_lines, j)
+        if length:
+            previous[index] = tails[length - 1]
+        if length == len(tails):
+            tails.append(index)
+            tail_lines.append(j)
+        else:
+            tails[length] = index
+            tail_lines[length] = j
+    anchors = []
+    index = tails[-1] if tails else None
+    while index is not None:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def diff_tasks(rows, texts):
+    # rows are the stored (id, position, text) in order, texts the edited
+    # lines. Returns (updates, deletes, inserts) for
+    # TaskRepository.apply_edits touching only the lines that changed.
+    # Runs in linear time apart from sorting the anchors, so scattered edits
+    # over a huge list stay fast where difflib would be quadratic.
+    updates, deletes, inserts = [], [], []
+    old = [row[2] for row in rows]
+    anchors = _unique_anchors(old, texts)
+    old_first = new_first = 0
+    for old_last, new_last in anchors + [(len(old), len(texts))]:
+        # Trim what the gap shares at either end, then pair the rest by
+        # index: changed lines become updates, the surplus deletes or
+        # inserts.
+        while old_first < old_last and new_first < new_last and old[old_first] == texts[new_first]:
+            old_first += 1
+            new_first += 1
+        old_end, new_end = old_last, new_last
+        while old_end > old_first and new_end > new_first and old[old_end - 1] == texts[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+        paired = min(old_end - old_first, new_end - new_first)
+        for offset in range(paired):
+            if old[old_first + offset] != texts[new_first + offset]:
+                updates.append((rows[old_first + offset][0], texts[new_first + offset]))
+        deletes.extend(row[0] for row in rows[old_first + paired:old_end])
+        added = texts[new_first + paired:new_end]
+        if added:
+            after_index = old_first + paired - 1
+            before = rows[old_end][1] if old_end < len(rows) else None
+            if after_index >= 0:
+                after = rows[after_index][1]
+            else:
+                after = before - 1 if before is not None else 0
+            inserts.append((after, before, added))
+        old_first, new_first = old_last + 1, new_last + 1
+    return updates, deletes, inserts
+
+
+class TaskImportThread(QThread):
+    # Parses on the worker thread and hands each batch to the UI thread,
+    # which commits it with one transaction and one rowsInserted. Only one
+    # batch is in flight at a time: the receiver calls batch_done() when it
+    # has committed, so the event loop gets to timers between batches.
+    batch_ready = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.imported = 0
+        self._in_flight = QSemaphore(1)
+
+    def batch_done(self):
+        self._in_flight.release()
+
+    def run(self):
+        try:
+            for batch in read_task_batches(self.path):
+                while not self._in_flight.tryAcquire(1, 100):
+                    if self.isInterruptionRequested():
+                        return
+                if self.isInterruptionRequested():
+                    return
+                self.imported += len(batch)
+                self.batch_ready.emit(batch)
+        except (OSError, UnicodeDecodeError, ValueError, csv.Error) as error:
+            self.failed.emit(str(error))
+
+
+class TaskExportThread(QThread):
+    failed = pyqtSignal(str)
+
+    def __init__(self, database_path, path, parent=None):
+        super().__init__(parent)
+        self.database_path = database_path
+        self.path = path
+        self.exported = 0
+
+    def run(self):
+        # SQLite connections are per thread; WAL lets this reader run while
+        # the UI keeps writing.
+        repository = TaskRepository(self.database_path)
+        try:
+            self.exported = write_tasks(self.path, self._pages(repository))
+        except OSError as error:
+            self.failed.emit(str(error))
+        finally:
+            repository.close()
+
+    def _pages(self, repository):
+        position = None
+        while not self.isInterruptionRequested():
+            rows = repository.page(position, BATCH_SIZE)
+            if not rows:
+                return
+            position = rows[-1][1]
+            yield [row[2] for row in rows]
+
+
+class TaskIndexThread(QThread):
+    built = pyqtSignal(object)
+
+    def __init__(self, database_path, parent=None):
+        super().__init__(parent)
+        self.database_path = database_path
+
+    def run(self):
+        # Tokenizing a large backlog takes a while in Python; doing it here
+        # keeps the countdown ticking while the first search waits.
+        repository = TaskRepository(self.database_path)
+        try:
+            index = TaskIndex(self._rows(repository))
+        finally:
+            repository.close()
+        if not self.isInterruptionRequested():
+            self.built.emit(index)
+
+    def _rows(self, repository):
+        position = None
+        while not self.isInterruptionRequested():
+            rows = repository.page(position, BATCH_SIZE)
+            if not rows:
+                return
+            position = rows[-1][1]
+            yield from rows
+
+
+class TaskDiffThread(QThread):
+    # Diffs the editor text against the rows it was loaded from and writes
+    # the changes through its own connection, off the UI thread.
+    failed = pyqtSignal(str)
+
+    def __init__(self, database_path, rows, texts, parent=None):
+        super().__init__(parent)
+        self.database_path = database_path
+        self.rows = rows
+        self.texts = texts
+        self.edits = None
+
+    def run(self):
+        self.edits = diff_tasks(self.rows, self.texts)
+        if self.isInterruptionRequested():
+            self.edits = None
+            return
+        repository = TaskRepository(self.database_path)
+        try:
+            repository.apply_edits(*self.edits)
+        except sqlite3.Error as error:
+            self.edits = None
+            self.failed.emit(str(error))
+        finally:
+            repository.close()
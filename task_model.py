@@ -0,0 +1,222 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, pyqtSignal
+
+from instrumentation import metrics
+from task_search import count_slots, iter_slots, terms_of
+from task_store import TaskStore
+
+
+class TaskListModel(QAbstractListModel):
+    task_completed = pyqtSignal(int, str)
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store if store is not None else TaskStore()
+        self.foreground = None
+        self.query = ''
+        # While a search is active the rows are index slots of the matching
+        # tasks, paged in from the result mask like the unfiltered list.
+        self.matches = None
+        self.match_mask = 0
+        self.match_count = 0
+
+    def is_filtered(self):
+        return self.matches is not None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self.matches is not None:
+            return len(self.matches)
+        return len(self.store)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        if self.matches is not None:
+            return len(self.matches) < self.match_count
+        return not self.store.is_fully_loaded()
+
+    @metrics.timed('task_list_fetch')
+    def fetchMore(self, parent=QModelIndex()):
+        if self.matches is not None:
+            self._fetch_matches()
+            return
+        # Tasks are paged in as the view scrolls, so a large backlog only
+        # reads the rows that are about to become visible.
+        rows = self.store.next_page()
+        if not rows:
+            self.store.total = len(self.store)
+            return
+        first = len(self.store)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.store.append_page(rows)
+        self.endInsertRows()
+
+    def _fetch_matches(self):
+        start = self.matches[-1] + 1 if self.matches else 0
+        slots = []
+        for slot in iter_slots(self.match_mask, start):
+            slots.append(slot)
+            if len(slots) == self.store.PAGE_SIZE:
+                break
+        if not slots:
+            self.match_count = len(self.matches)
+            return
+        first = len(self.matches)
+        self.beginInsertRows(QModelIndex(), first, first + len(slots) - 1)
+        self.matches.extend(slots)
+        self.endInsertRows()
+
+    def id_at(self, row):
+        if self.matches is not None:
+            return self.store.index.id_at(self.matches[row])
+        return self.store.id_at(row)
+
+    def text_at(self, row):
+        if self.matches is not None:
+            return self.store.index.text(self.id_at(row))
+        return self.store.text_at(row)
+
+    def number_at(self, row):
+        if self.matches is not None:
+            return self.store.index.rank(self.matches[row])
+        return row + 1
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            # Numbers are derived from the row, so removing a task never
+            # requires rewriting the labels of the tasks below it.
+            return f"{self.number_at(index.row())}. {self.text_at(index.row())}"
+        if role == Qt.EditRole:
+            return self.text_at(index.row())
+        if role == Qt.CheckStateRole:
+            return Qt.Unchecked
+        if role == Qt.ForegroundRole:
+            return self.foreground
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        if role == Qt.CheckStateRole and value == Qt.Checked:
+            self.complete_row(index.row())
+            return True
+        if role == Qt.EditRole:
+            self.store.update(self.id_at(index.row()), value)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+            return True
+        return False
+
+    def add_task(self, text):
+        if self.matches is not None:
+            task_id = self.store.add(text)
+            self.refresh_filter()
+            return task_id
+        if not self.store.is_fully_loaded():
+            # The new row shows up once the view pages down to it.
+            return self.store.add(text)
+        row = len(self.store)
+        self.beginInsertRows(QModelIndex(), row, row)
+        task_id = self.store.add(text)
+        self.endInsertRows()
+        return task_id
+
+    def add_tasks(self, texts):
+        if not texts:
+            return
+        self.store.add_many(texts)
+        if self.matches is not None:
+            self.refresh_filter()
+            return
+        # Inserting every row of a large import would make the view lay out
+        # the whole list per batch; fill the first page and let scrolling
+        # fetch the rest.
+        if len(self.store) < self.store.PAGE_SIZE:
+            self.fetchMore()
+
+    def complete_row(self, row):
+        task_id = self.id_at(row)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        text = self.store.complete(task_id, None if self.matches is not None else row)
+        if self.matches is not None:
+            self.match_mask &= ~(1 << self.matches.pop(row))
+            self.match_count -= 1
+        self.endRemoveRows()
+        self.task_completed.emit(task_id, text)
+
+    @metrics.timed('task_search')
+    def set_filter(self, query):
+        # Filters the list to tasks containing every word of the query as a
+        # word prefix. Until the store has a search index the query is only
+        # remembered; refresh_filter applies it once the index is attached.
+        self.query = query
+        index = self.store.index
+        if not terms_of(query) or index is None:
+            if self.matches is not None:
+                self.beginResetModel()
+                self.matches = None
+                self.endResetModel()
+            return
+        mask = index.search(query)
+        if self.matches is not None and not mask & ~self.match_mask:
+            self._narrow(mask)
+            return
+        self.beginResetModel()
+        self.matches = []
+        self.match_mask = mask
+        self.match_count = count_slots(mask)
+        self.endResetModel()
+        self._fetch_matches()
+
+    def refresh_filter(self):
+        # Runs the query again from scratch, e.g. after tasks were added or
+        # the search index was attached.
+        if self.matches is not None:
+            self.beginResetModel()
+            self.matches = None
+            self.endResetModel()
+        self.set_filter(self.query)
+
+    def _narrow(self, mask):
+        # The new results are a subset of the shown ones, so drop the rows
+        # that stopped matching instead of resetting; the view keeps its
+        # scroll position and selection.
+        if self.matches:
+            loaded = mask & ((1 << (self.matches[-1] + 1)) - 1)
+            kept = set(iter_slots(loaded))
+            row = len(self.matches)
+            while row > 0:
+                row -= 1
+                if self.matches[row] in kept:
+                    continue
+                last = row
+                while row > 0 and self.matches[row - 1] not in kept:
+                    row -= 1
+                self.beginRemoveRows(QModelIndex(), row, last)
+                del self.matches[row:last + 1]
+                self.endRemoveRows()
+        self.match_mask = mask
+        self.match_count = count_slots(mask)
+        if len(self.matches) < self.store.PAGE_SIZE and self.canFetchMore():
+            self._fetch_matches()
+
+    def reload(self):
+        # The reload drops the store's search index, so a search shows the
+        # whole list again until a new index is attached.
+        self.beginResetModel()
+        self.store.reload()
+        self.matches = None
+        self.endResetModel()
+
+    def set_foreground(self, color):
+        self.foreground = color
+        rows = self.rowCount()
+        if rows:
+            self.dataChanged.emit(self.index(0), self.index(rows - 1), [Qt.ForegroundRole])
@@ -0,0 +1,128 @@
+import os
+import sqlite3
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    completed_at REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_open ON tasks (done, position);
+"""
+
+
+class TaskRepository:
+    MIN_GAP = 1e-6  # closest fractional positions get before the open rows are renumbered
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def is_empty(self):
+        return self.connection.execute('SELECT 1 FROM tasks LIMIT 1').fetchone() is None
+
+    def count_open(self):
+        return self.connection.execute('SELECT COUNT(*) FROM tasks WHERE done = 0').fetchone()[0]
+
+    def page(self, after_position=None, limit=100):
+        # Keyset paging over open tasks; returns (id, position, text) rows.
+        if after_position is None:
+            after_position = float('-inf')  # lines inserted at the top may go below zero
+        return self.connection.execute(
+            'SELECT id, position, text FROM tasks WHERE done = 0 AND position > ? ORDER BY position LIMIT ?',
+            (after_position, limit),
+        ).fetchall()
+
+    def open_rows(self):
+        return self.connection.execute(
+            'SELECT id, position, text FROM tasks WHERE done = 0 ORDER BY position'
+        ).fetchall()
+
+    def _next_position(self):
+        return self.connection.execute('SELECT COALESCE(MAX(position), 0) + 1 FROM tasks').fetchone()[0]
+
+    def add(self, text):
+        with self.connection:
+            position = self._next_position()
+            cursor = self.connection.execute(
+                'INSERT INTO tasks (position, text, created_at) VALUES (?, ?, ?)',
+                (position, text, time.time()),
+            )
+        return cursor.lastrowid, position
+
+    def add_many(self, texts):
+        with self.connection:
+            position = self._next_position()
+            now = time.time()
+            self.connection.executemany(
+                'INSERT INTO tasks (position, text, created_at) VALUES (?, ?, ?)',
+                ((position + offset, text, now) for offset, text in enumerate(texts)),
+            )
+
+    def update(self, task_id, text):
+        with self.connection:
+            self.connection.execute('UPDATE tasks SET text = ? WHERE id = ?', (text, task_id))
+
+    def complete(self, task_id):
+        with self.connection:
+            self.connection.execute(
+                'UPDATE tasks SET done = 1, completed_at = ? WHERE id = ?', (time.time(), task_id)
+            )
+
+    def apply_edits(self, updates=(), deletes=(), inserts=()):
+        # updates: (task_id, text); deletes: task_id; inserts: (after, before,
+        # texts) placing texts between two existing positions (before may be
+        # None for the end). Positions may become fractional; SQLite keeps
+        # them as REAL in the INTEGER column and they still sort correctly.
+        with self.connection:
+            self.connection.executemany('UPDATE tasks SET text = ? WHERE id = ?', ((text, task_id) for task_id, text in updates))
+            self.connection.executemany('DELETE FROM tasks WHERE id = ?', ((task_id,) for task_id in deletes))
+            if any(before is not None and (before - after) / (len(texts) + 1) < self.MIN_GAP for after, before, texts in inserts):
+                # Repeated halving would eventually give two rows the same
+                # position, and keyset paging skips ties.
+                moved = self._renumber_open()
+                inserts = [
+                    (moved[after] if after in moved else moved[before] - 1, moved.get(before, before), texts)
+                    if before is not None else (after, before, texts)
+                    for after, before, texts in inserts
+                ]
+            now = time.time()
+            for after, before, texts in inserts:
+                if before is None:
+                    start = self._next_position()
+                    positions = [start + offset for offset in range(len(texts))]
+                else:
+                    step = (before - after) / (len(texts) + 1)
+                    positions = [after + step * (offset + 1) for offset in range(len(texts))]
+                self.connection.executemany(
+                    'INSERT INTO tasks (position, text, created_at) VALUES (?, ?, ?)',
+                    ((position, text, now) for position, text in zip(positions, texts)),
+                )
+
+    def _renumber_open(self):
+        # Gives the open rows consecutive integer positions in their current
+        # order; returns old position -> new position.
+        rows = self.connection.execute(
+            'SELECT id, position FROM tasks WHERE done = 0 ORDER BY position, id'
+        ).fetchall()
+        moved = {}
+        for new_position, (task_id, position) in enumerate(rows, start=1):
+            moved.setdefault(position, new_position)
+        self.connection.executemany(
+            'UPDATE tasks SET position = ? WHERE id = ?',
+            ((new_position, task_id) for new_position, (task_id, _) in enumerate(rows, start=1)),
+        )
+        return moved
@@ -0,0 +1,252 @@
+import bisect
+import re
+
+
+TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return set(TOKEN.findall(text.casefold()))
+
+
+def terms_of(query):
+    return TOKEN.findall(query.casefold())
+
+
+def bits_of(slots):
+    # Builds a bitmask in one pass; OR-ing 1 << slot per slot would copy the
+    # growing integer every time.
+    if not slots:
+        return 0
+    bits = bytearray((max(slots) >> 3) + 1)
+    for slot in slots:
+        bits[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def count_slots(mask):
+    # int.bit_count() would do, but only exists from Python 3.10.
+    return bin(mask).count('1')
+
+
+NONZERO = re.compile(rb'[^\x00]')
+BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+
+def iter_slots(mask, start=0):
+    # Set bits of mask from start upwards, lowest first. Scanning the bytes
+    # skips empty stretches in C instead of shifting the whole mask per bit.
+    mask >>= start
+    data = mask.to_bytes((mask.bit_length() + 7) >> 3, 'little')
+    for match in NONZERO.finditer(data):
+        offset = match.start()
+        base = start + (offset << 3)
+        for bit in BYTE_BITS[data[offset]]:
+            yield base + bit
+
+
+# Postings map a token or prefix to the slots holding it. Rare keys keep a
+# plain list; once a key is common it becomes a bitmask, so unions and
+# intersections over thousands of tasks are a handful of integer operations.
+DENSE = 64
+
+
+def posting_add(table, key, slot):
+    posting = table.get(key)
+    if posting is None:
+        table[key] = [slot]
+    elif type(posting) is int:
+        table[key] = posting | 1 << slot
+    else:
+        posting.append(slot)
+        if len(posting) >= DENSE:
+            table[key] = bits_of(posting)
+
+
+def posting_discard(table, key, slot):
+    # Returns False once the key no longer holds any slot.
+    posting = table[key]
+    if type(posting) is int:
+        posting &= ~(1 << slot)
+        table[key] = posting
+        return bool(posting)
+    table[key] = posting = [other for other in posting if other != slot]
+    return bool(posting)
+
+
+def posting_bits(posting):
+    return posting if type(posting) is int else bits_of(posting)
+
+
+class TaskIndex:
+    # Token index over every open task. Each task owns a slot assigned in
+    # display order, so a result is a bitmask whose set bits are already
+    # sorted; queries match every term as a word prefix.
+    SHORT_PREFIX = 2  # prefixes this short match too many words to union per query
+
+    def __init__(self, rows=()):
+        self._ids = []  # slot -> task id
+        self._slots = {}  # task id -> slot
+        self._texts = {}  # task id -> text
+        self._tokens = {}  # task id -> tokens
+        self._postings = {}  # token -> posting
+        self._prefixes = {}  # short prefix -> posting
+        self._vocabulary = []  # sorted tokens, for prefix ranges
+        self.open = 0  # bitmask of every indexed slot
+        self.last_position = None
+        self._forget()
+        self._build(rows)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, task_id):
+        return task_id in self._slots
+
+    def _build(self, rows):
+        # rows are (id, position, text) in display order, as returned by
+        # TaskRepository.open_rows().
+        postings = {}
+        for task_id, position, text in rows:
+            slot = len(self._ids)
+            tokens = tokenize(text)
+            self._ids.append(task_id)
+            self._slots[task_id] = slot
+            self._texts[task_id] = text
+            self._tokens[task_id] = tokens
+            self.last_position = position
+            for token in tokens:
+                slots = postings.get(token)
+                if slots is None:
+                    postings[token] = [slot]
+                else:
+                    slots.append(slot)
+        # A short prefix holds the slots of every token starting with it; a
+        # task may be listed twice, which the posting absorbs.
+        prefixes = {}
+        for token, slots in postings.items():
+            for prefix in self._short_prefixes((token,)):
+                prefixes.setdefault(prefix, []).extend(slots)
+        for table in (postings, prefixes):
+            for key, slots in table.items():
+                if len(slots) >= DENSE:
+                    table[key] = bits_of(slots)
+        self._postings = postings
+        self._prefixes = prefixes
+        self._vocabulary = sorted(self._postings)
+        self.open = (1 << len(self._ids)) - 1
+        self._forget()
+
+    def add(self, task_id, position, text):
+        # New tasks always go to the end of the list.
+        slot = len(self._ids)
+        self._ids.append(task_id)
+        self._slots[task_id] = slot
+        self.open |= 1 << slot
+        self.last_position = position
+        self._index(task_id, slot, text)
+
+    def catch_up(self, repository):
+        # Picks up tasks appended behind the index's back, such as a bulk
+        # import, without rereading the rest of the list.
+        for task_id, position, text in repository.page(self.last_position, -1):
+            if task_id not in self._slots:
+                self.add(task_id, position, text)
+
+    def update(self, task_id, text):
+        slot = self._slots.get(task_id)
+        if slot is not None:
+            self._unindex(task_id, slot)
+            self._index(task_id, slot, text)
+
+    def remove(self, task_id):
+        slot = self._slots.pop(task_id, None)
+        if slot is not None:
+            self._unindex(task_id, slot)
+            self.open &= ~(1 << slot)
+
+    def _index(self, task_id, slot, text):
+        tokens = tokenize(text)
+        self._texts[task_id] = text
+        self._tokens[task_id] = tokens
+        for token in tokens:
+            if token not in self._postings:
+                bisect.insort(self._vocabulary, token)
+            posting_add(self._postings, token, slot)
+        for prefix in self._short_prefixes(tokens):
+            posting_add(self._prefixes, prefix, slot)
+        self._forget()
+
+    def _unindex(self, task_id, slot):
+        tokens = self._tokens.pop(task_id)
+        del self._texts[task_id]
+        for token in tokens:
+            if not posting_discard(self._postings, token, slot):
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+        for prefix in self._short_prefixes(tokens):
+            if not posting_discard(self._prefixes, prefix, slot):
+                del self._prefixes[prefix]
+        self._forget()
+
+    def _short_prefixes(self, tokens):
+        return {token[:length] for token in tokens for length in range(1, self.SHORT_PREFIX + 1)}
+
+    def _forget(self):
+        self._last_terms = ()
+        self._last_masks = ()
+        self._last_result = 0
+
+    def term_mask(self, term):
+        if len(term) <= self.SHORT_PREFIX:
+            posting = self._prefixes.get(term)
+            return posting_bits(posting) if posting is not None else 0
+        vocabulary = self._vocabulary
+        start = bisect.bisect_left(vocabulary, term)
+        end = bisect.bisect_left(vocabulary, term + '\U0010ffff', start)
+        mask = 0
+        sparse = []
+        for token in vocabulary[start:end]:
+            posting = self._postings[token]
+            if type(posting) is int:
+                mask |= posting
+            else:
+                sparse.extend(posting)
+        return mask | bits_of(sparse)
+
+    def search(self, query):
+        # Returns a bitmask of matching slots. Terms unchanged since the last
+        # query reuse their masks, and a query that only narrows the last
+        # one (a term grew or a term was added) is intersected with the last
+        # result instead of with the whole list.
+        terms = terms_of(query)
+        if not terms:
+            self._forget()
+            return self.open
+        last_terms = self._last_terms
+        narrows = bool(last_terms) and len(terms) >= len(last_terms) and all(
+            term.startswith(last) for term, last in zip(terms, last_terms)
+        )
+        result = self._last_result if narrows else self.open
+        reused = dict(zip(last_terms, self._last_masks))
+        masks = []
+        for term in terms:
+            mask = reused.get(term)
+            if mask is None:
+                mask = self.term_mask(term)
+            masks.append(mask)
+            result &= mask
+        self._last_terms = tuple(terms)
+        self._last_masks = tuple(masks)
+        self._last_result = result
+        return result
+
+    def id_at(self, slot):
+        return self._ids[slot]
+
+    def text(self, task_id):
+        return self._texts[task_id]
+
+    def rank(self, slot):
+        # Position of the task in the unfiltered list, counting from 1.
+        return count_slots(self.open & ((1 << slot) - 1)) + 1
@@ -0,0 +1,114 @@
+from task_repository import TaskRepository
+
+
+class TaskStore:
+    PAGE_SIZE = 100
+
+    def __init__(self, repository=None):
+        self.repository = repository if repository is not None else TaskRepository()
+        self._order = []  # ids of the open tasks loaded so far, in display order
+        self._texts = {}  # task id -> text
+        self._last_position = None
+        self.total = self.repository.count_open()
+        self.index = None  # TaskIndex over every open task, built on demand for search
+        self._index_log = None  # changes made while an index is being built
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, task_id):
+        return task_id in self._texts
+
+    def is_fully_loaded(self):
+        return len(self._order) >= self.total
+
+    def next_page(self):
+        return self.repository.page(self._last_position, self.PAGE_SIZE)
+
+    def append_page(self, rows):
+        for task_id, position, text in rows:
+            self._order.append(task_id)
+            self._texts[task_id] = text
+            self._last_position = position
+        if len(rows) < self.PAGE_SIZE:
+            self.total = len(self._order)
+
+    def id_at(self, row):
+        return self._order[row]
+
+    def text(self, task_id):
+        return self._texts[task_id]
+
+    def text_at(self, row):
+        return self._texts[self._order[row]]
+
+    def add(self, text):
+        fully_loaded = self.is_fully_loaded()
+        task_id, position = self.repository.add(text)
+        self.total += 1
+        if fully_loaded:
+            self._order.append(task_id)
+            self._texts[task_id] = text
+            self._last_position = position
+        if self.index is not None:
+            self.index.add(task_id, position, text)
+        return task_id
+
+    def add_many(self, texts):
+        # Bulk additions are not appended to the loaded rows; they are paged
+        # in like the rest of the backlog.
+        self.repository.add_many(texts)
+        self.total += len(texts)
+        if self.index is not None:
+            self.index.catch_up(self.repository)
+
+    def update(self, task_id, text):
+        self.repository.update(task_id, text)
+        if task_id in self._texts:
+            self._texts[task_id] = text
+        self._reindex('update', task_id, text)
+
+    def complete(self, task_id, row=None):
+        # row is the task's loaded row when the caller knows it. A task found
+        # through the search index is looked up by id instead, and may not
+        # be loaded at all if the list has not paged down to it yet.
+        if row is None and task_id in self._texts:
+            row = self._order.index(task_id)
+        if row is not None:
+            self._order.pop(row)
+            text = self._texts.pop(task_id)
+        else:
+            text = self.index.text(task_id)
+        self.repository.complete(task_id)
+        self.total -= 1
+        self._reindex('remove', task_id)
+        return text
+
+    def begin_index(self):
+        # Called when a TaskIndex starts building from a snapshot of the
+        # database; edits made meanwhile are replayed by attach_index.
+        self._index_log = []
+
+    def attach_index(self, index):
+        if self._index_log is None:
+            return False  # the list was reloaded while the index was built
+        for change, task_id, *text in self._index_log:
+            getattr(index, change)(task_id, *text)
+        index.catch_up(self.repository)
+        self.index = index
+        self._index_log = None
+        return True
+
+    def _reindex(self, change, task_id, *text):
+        if self.index is not None:
+            getattr(self.index, change)(task_id, *text)
+        elif self._index_log is not None:
+            self._index_log.append((change, task_id) + text)
+
+    def reload(self):
+        self._order.clear()
+        self._texts.clear()
+        self._last_position = None
+        self.total = self.repository.count_open()
+        self.index = None
+        self._index_log = None
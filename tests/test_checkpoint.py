@@ -0,0 +1,59 @@
+from checkpoint import ACTIVE, IDLE, LAYOUT, PAUSED, Checkpoint
+from timer_core import PomodoroCore, VirtualClock
+
+
+def make_core():
+    clock = VirtualClock(100.0)
+    core = PomodoroCore(work_duration=1500, break_duration=300, clock=clock, wall_clock=lambda: 5000.0)
+    return core, clock
+
+
+def test_round_trip_of_an_active_session(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / 'checkpoint.bin'))
+    core, clock = make_core()
+    core.start()
+    core.pause()
+    core.start()
+    clock.advance(100)
+    checkpoint.save(core, task_id=7, now=1000.0)
+    assert checkpoint.load() == {
+        'is_break': False,
+        'state': ACTIVE,
+        'deadline': 2400.0,
+        'remaining': 1400.0,
+        'duration': 1500,
+        'started_at': 5000.0,
+        'interruptions': 1,
+        'task_id': 7,
+    }
+
+
+def test_paused_and_idle_states(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / 'checkpoint.bin'))
+    core, _ = make_core()
+    checkpoint.save(core, now=0.0)
+    saved = checkpoint.load()
+    assert saved['state'] == IDLE
+    assert saved['task_id'] is None
+    core.toggle_break()
+    core.pause()
+    checkpoint.save(core, now=0.0)
+    saved = checkpoint.load()
+    assert saved['state'] == PAUSED
+    assert saved['is_break']
+
+
+def test_missing_truncated_or_foreign_files_load_as_none(tmp_path):
+    path = tmp_path / 'checkpoint.bin'
+    checkpoint = Checkpoint(str(path))
+    assert checkpoint.load() is None
+    core, _ = make_core()
+    checkpoint.save(core, now=0.0)
+    data = path.read_bytes()
+    assert len(data) == LAYOUT.size
+    path.write_bytes(data[:-1])
+    assert checkpoint.load() is None
+    path.write_bytes(data + b'\0')
+    assert checkpoint.load() is None
+    path.write_bytes(b'XXXX' + data[4:])
+    assert checkpoint.load() is None
@@ -0,0 +1,74 @@
+import datetime
+
+import pytest
+
+from history import SessionHistory, week_number
+from timer_core import Session
+
+
+def at(day, hour):
+    return datetime.datetime.combine(day, datetime.time(hour)).timestamp()
+
+
+def rollups(history):
+    tables = {}
+    for table, column in (('daily_rollup', 'day'), ('weekly_rollup', 'week')):
+        tables[table] = history.connection.execute(
+            f'SELECT {column}, kind, sessions, completed, seconds, interruptions FROM {table} ORDER BY {column}, kind'
+        ).fetchall()
+    return tables
+
+
+@pytest.fixture
+def history():
+    history = SessionHistory(':memory:')
+    yield history
+    history.close()
+
+
+# Saturday 2024-01-06 to Tuesday 2024-01-09 crosses the Monday week start.
+SATURDAY = datetime.date(2024, 1, 6)
+MONDAY = datetime.date(2024, 1, 8)
+
+
+def record_days(history):
+    for offset in range(4):
+        day = SATURDAY + datetime.timedelta(days=offset)
+        history.record(Session('work', at(day, 9), at(day, 9) + 1500, 1500.0, True, offset), task_id=offset, task=f'task {offset}')
+        history.record(Session('break', at(day, 10), at(day, 10) + 300, 300.0, True, 0))
+        history.record(Session('work', at(day, 11), at(day, 11) + 600, 600.0, False, 1), task_id=1, task='task 1')
+
+
+def test_incremental_rollups_match_a_rebuild(history):
+    record_days(history)
+    incremental = rollups(history)
+    history.rebuild_rollups()
+    assert rollups(history) == incremental
+    weeks = {week for week, *_ in incremental['weekly_rollup']}
+    assert weeks == {week_number(SATURDAY.toordinal()), MONDAY.toordinal()}
+
+
+def test_daily_and_weekly_totals(history):
+    record_days(history)
+    last_day = SATURDAY + datetime.timedelta(days=3)
+    daily = history.daily_totals(SATURDAY, last_day)
+    assert [row[0] for row in daily] == [SATURDAY + datetime.timedelta(days=offset) for offset in range(4)]
+    assert daily[0] == (SATURDAY, 2, 1, 2100.0, 1)
+    assert history.daily_totals(SATURDAY, last_day, kind='break')[0] == (SATURDAY, 1, 1, 300.0, 0)
+    assert history.weekly_totals(SATURDAY, last_day) == [
+        (datetime.date(2024, 1, 1), 4, 2, 4200.0, 3),
+        (MONDAY, 4, 2, 4200.0, 7),
+    ]
+
+
+def test_focus_minutes_per_day_skips_idle_days(history):
+    record_days(history)
+    today = SATURDAY + datetime.timedelta(days=8)
+    assert history.focus_minutes_per_day(7, today) == [(MONDAY, 35.0), (MONDAY + datetime.timedelta(days=1), 35.0)]
+
+
+def test_task_sessions_are_in_start_order(history):
+    record_days(history)
+    sessions = history.task_sessions(1)
+    assert [row[0] for row in sessions] == sorted(row[0] for row in sessions)
+    assert len(sessions) == 5
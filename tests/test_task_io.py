@@ -0,0 +1,99 @@
+import random
+
+from task_io import diff_tasks
+from task_repository import TaskRepository
+
+
+def paged_texts(repository, page_size=7):
+    texts = []
+    position = None
+    while True:
+        rows = repository.page(position, page_size)
+        if not rows:
+            return texts
+        position = rows[-1][1]
+        texts.extend(row[2] for row in rows)
+
+
+def save(repository, texts):
+    repository.apply_edits(*diff_tasks(repository.open_rows(), texts))
+
+
+def test_diff_touches_only_changed_lines():
+    rows = [(1, 1, 'a'), (2, 2, 'b'), (3, 3, 'c')]
+    updates, deletes, inserts = diff_tasks(rows, ['a', 'B', 'c', 'd'])
+    assert updates == [(2, 'B')]
+    assert deletes == []
+    assert inserts == [(3, None, ['d'])]
+
+
+def test_diff_round_trip_pages_back_the_edited_text():
+    repository = TaskRepository()
+    repository.add_many(['first', 'second', 'third'])
+    for texts in (
+        ['zero', 'first', 'second', 'third'],
+        ['zero', 'first', 'inserted', 'second'],
+        ['first', 'second changed'],
+        [],
+        ['again'],
+    ):
+        save(repository, texts)
+        assert paged_texts(repository) == texts
+
+
+def test_repeated_inserts_at_one_spot_stay_reachable():
+    repository = TaskRepository()
+    repository.add_many(['top', 'bottom'])
+    texts = ['top', 'bottom']
+    for number in range(120):
+        texts.insert(1, f'middle {number}')
+        save(repository, texts)
+    positions = [row[1] for row in repository.open_rows()]
+    assert len(set(positions)) == len(positions)
+    assert paged_texts(repository) == texts
+
+
+def test_repeated_inserts_at_the_top_stay_reachable():
+    repository = TaskRepository()
+    repository.add_many(['last'])
+    texts = ['last']
+    for number in range(60):
+        texts.insert(0, f'new {number}')
+        save(repository, texts)
+    assert paged_texts(repository) == texts
+
+
+def test_random_edits_round_trip():
+    rng = random.Random(3)
+    repository = TaskRepository()
+    texts = [f'task {number}' for number in range(30)]
+    repository.add_many(texts)
+    for step in range(300):
+        texts = list(texts)
+        for change in range(rng.randint(1, 4)):
+            where = rng.randint(0, len(texts))
+            roll = rng.random()
+            if roll < 0.5 or not texts:
+                texts.insert(where, f'new {step}.{change}')
+            elif roll < 0.8:
+                del texts[min(where, len(texts) - 1)]
+            else:
+                texts[min(where, len(texts) - 1)] += '!'
+        save(repository, texts)
+        assert paged_texts(repository) == texts
+
+
+def test_scattered_edits_update_only_the_edited_lines():
+    texts = [f'task {number}' for number in range(20000)]
+    rows = [(number + 1, number + 1, text) for number, text in enumerate(texts)]
+    edited = [text + ' (edited)' if number % 3 == 0 else text for number, text in enumerate(texts)]
+    updates, deletes, inserts = diff_tasks(rows, edited)
+    assert len(updates) == 6667
+    assert deletes == [] and inserts == []
+
+
+def test_edits_among_duplicate_lines_stay_local():
+    rows = [(number, number, 'todo') for number in range(1, 11)]
+    updates, deletes, inserts = diff_tasks(rows, ['todo'] * 5 + ['new'] + ['todo'] * 5)
+    assert updates == [] and deletes == []
+    assert inserts == [(5, 6, ['new'])]
@@ -0,0 +1,64 @@
+from task_search import TaskIndex, count_slots, iter_slots
+
+
+def matching_ids(index, query):
+    return [index.id_at(slot) for slot in iter_slots(index.search(query))]
+
+
+def make_index():
+    return TaskIndex([
+        (1, 1, 'Write the report'),
+        (2, 2, 'Review report draft'),
+        (3, 3, 'Fix login bug'),
+        (4, 4, 'write tests for login'),
+    ])
+
+
+def test_terms_match_word_prefixes_case_insensitively():
+    index = make_index()
+    assert matching_ids(index, 'rep') == [1, 2]
+    assert matching_ids(index, 'WRI') == [1, 4]
+    assert matching_ids(index, 'login w') == [4]
+    assert matching_ids(index, 'port') == []
+
+
+def test_empty_query_matches_everything_in_order():
+    assert matching_ids(make_index(), '  ') == [1, 2, 3, 4]
+
+
+def test_narrowing_and_widening_give_fresh_results():
+    index = make_index()
+    assert matching_ids(index, 'r') == [1, 2]
+    assert matching_ids(index, 're') == [1, 2]
+    assert matching_ids(index, 'rev') == [2]
+    assert matching_ids(index, 'review d') == [2]
+    assert matching_ids(index, 'r') == [1, 2]
+
+
+def test_common_tokens_switch_to_bitmasks():
+    rows = [(number, number, f'common task {number}') for number in range(1, 201)]
+    index = TaskIndex(rows)
+    assert count_slots(index.search('common')) == 200
+    assert matching_ids(index, 'task 150') == [150]
+    index.remove(150)
+    assert count_slots(index.search('com')) == 199
+    assert matching_ids(index, '150') == []
+
+
+def test_add_update_and_remove_keep_the_index_current():
+    index = make_index()
+    index.add(5, 5, 'Report to the team')
+    assert matching_ids(index, 'report') == [1, 2, 5]
+    index.update(2, 'Review slides')
+    assert matching_ids(index, 'report') == [1, 5]
+    assert matching_ids(index, 'slid') == [2]
+    index.remove(1)
+    assert matching_ids(index, 'report') == [5]
+    assert 1 not in index
+    assert matching_ids(index, 'the') == [5]
+
+
+def test_rank_counts_only_open_tasks():
+    index = make_index()
+    index.remove(2)
+    assert index.rank(index.search('fix').bit_length() - 1) == 2
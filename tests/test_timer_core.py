@@ -0,0 +1,154 @@
+import pytest
+
+from timer_core import Countdown, PomodoroCore, VirtualClock
+
+
+def make_core(work=60, rest=10):
+    clock = VirtualClock(1000.0)
+    core = PomodoroCore(work, rest, clock=clock, wall_clock=clock)
+    sessions = []
+    core.session_listeners.append(sessions.append)
+    return core, clock, sessions
+
+
+def test_start_counts_down_on_the_clock():
+    core, clock, sessions = make_core()
+    assert core.remaining() == 60
+    core.start()
+    assert core.is_running and core.is_active
+    clock.advance(12.5)
+    assert core.remaining() == pytest.approx(47.5)
+    assert core.display_seconds() == 48
+    assert sessions == []
+
+
+def test_pause_freezes_the_countdown_and_counts_an_interruption():
+    core, clock, sessions = make_core()
+    core.start()
+    clock.advance(10)
+    core.pause()
+    assert not core.is_active and core.is_running
+    clock.advance(100)
+    assert core.remaining() == pytest.approx(50)
+    core.start()
+    clock.advance(50)
+    assert core.poll()
+    assert sessions[0].interruptions == 1
+    assert sessions[0].completed
+
+
+def test_pause_while_paused_is_not_an_interruption():
+    core, clock, _ = make_core()
+    core.start()
+    core.pause()
+    core.pause()
+    assert core.interruptions == 1
+
+
+def test_reset_ends_the_session_uncompleted():
+    core, clock, sessions = make_core()
+    core.start()
+    clock.advance(20)
+    core.reset()
+    assert not core.is_running and not core.is_active
+    assert core.remaining() == 60
+    [session] = sessions
+    assert session.kind == 'work'
+    assert not session.completed
+    assert session.elapsed == pytest.approx(20)
+    assert session.started_at == 1000 and session.ended_at == 1020
+
+
+def test_reset_when_idle_records_nothing():
+    core, _, sessions = make_core()
+    core.reset()
+    assert sessions == []
+
+
+def test_toggle_break_switches_kind_and_starts_running():
+    core, clock, sessions = make_core()
+    core.start()
+    clock.advance(5)
+    core.toggle_break()
+    assert core.is_break and core.is_active
+    assert core.remaining() == 10
+    assert [session.kind for session in sessions] == ['work']
+    clock.advance(10)
+    assert core.poll()
+    assert [session.kind for session in sessions] == ['work', 'break']
+    assert sessions[1].completed
+    core.toggle_break()
+    assert not core.is_break
+    assert core.remaining() == 60
+
+
+def test_poll_fires_exactly_once_at_the_deadline():
+    core, clock, sessions = make_core()
+    core.start()
+    clock.advance(59.999)
+    assert not core.poll()
+    clock.advance(0.001)
+    assert core.poll()
+    assert not core.poll()
+    assert not core.is_running
+    assert core.completed_sessions == 1
+    assert core.remaining() == 60
+    assert len(sessions) == 1
+
+
+def test_poll_while_paused_never_fires():
+    core, clock, _ = make_core()
+    core.start()
+    clock.advance(30)
+    core.pause()
+    clock.advance(1000)
+    assert not core.poll()
+
+
+def test_set_durations_restarts_only_the_current_kind():
+    core, clock, _ = make_core()
+    core.start()
+    clock.advance(10)
+    core.set_durations(break_duration=20)
+    assert core.remaining() == pytest.approx(50)
+    core.set_durations(work_duration=120)
+    assert core.is_active
+    assert core.remaining() == 120
+    clock.advance(20)
+    assert core.remaining() == pytest.approx(100)
+
+
+def test_set_durations_keeps_a_paused_session_paused():
+    core, clock, _ = make_core()
+    core.start()
+    core.pause()
+    core.set_durations(work_duration=30)
+    assert not core.is_active
+    clock.advance(10)
+    assert core.remaining() == 30
+
+
+@pytest.mark.parametrize('remaining, shown', [
+    (60, 60), (59.2, 60), (59.0000001, 59), (0.4, 1), (0.0000001, 0), (0, 0), (-1, 0),
+])
+def test_display_seconds_rounds_up(remaining, shown):
+    assert Countdown(60).display_seconds(remaining) == shown
+
+
+@pytest.mark.parametrize('remaining, boundary', [
+    (59.25, 0.25), (59.0, 1.0), (0.5, 0.5), (59.0000001, 1.0),
+])
+def test_next_boundary_is_when_the_display_changes(remaining, boundary):
+    assert Countdown(60).next_boundary(remaining) == pytest.approx(boundary)
+
+
+def test_next_boundary_follows_the_clock():
+    clock = VirtualClock()
+    countdown = Countdown(60, clock)
+    countdown.start()
+    clock.advance(0.3)
+    shown = countdown.display_seconds()
+    clock.advance(countdown.next_boundary() - 0.001)
+    assert countdown.display_seconds() == shown
+    clock.advance(0.002)
+    assert countdown.display_seconds() == shown - 1
@@ -0,0 +1,54 @@
+import pytest
+from PyQt5.QtCore import QCoreApplication, Qt
+
+from timer_core import PomodoroCore, VirtualClock
+from timer_engine import DeadlineTimer
+
+
+@pytest.fixture(scope='module', autouse=True)
+def application():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def run_until_expired(duration, low_power):
+    # Fires every wakeup exactly when it was requested, on a virtual clock.
+    clock = VirtualClock()
+    core = PomodoroCore(work_duration=duration, clock=clock, wall_clock=clock)
+    timer = DeadlineTimer(core)
+    events = []
+    timer.warning.connect(lambda: events.append(('warning', clock.now)))
+    timer.expired.connect(lambda: events.append(('expired', clock.now)))
+    timer.set_low_power(low_power)
+    core.start()
+    timer.sync()
+    while not events or events[-1][0] != 'expired':
+        clock.advance(timer._timer.interval() / 1000)
+        timer._on_timeout()
+    timer._timer.stop()
+    return events, timer
+
+
+@pytest.mark.parametrize('duration', [0.5, 3, 25, 55, 61.5, 150])
+@pytest.mark.parametrize('low_power', [False, True])
+def test_session_end_is_noticed_on_time(duration, low_power):
+    events, timer = run_until_expired(duration, low_power)
+    assert events[-1][1] == pytest.approx(duration, abs=0.002)  # whole milliseconds
+    assert timer._timer.timerType() == Qt.PreciseTimer
+
+
+@pytest.mark.parametrize('duration', [3, 25, 45, 55, 61.5, 150])
+@pytest.mark.parametrize('low_power', [False, True])
+def test_warning_fires_lead_seconds_before_the_end(duration, low_power):
+    events, _ = run_until_expired(duration, low_power)
+    assert [name for name, _ in events] == ['warning', 'expired']
+    assert events[0][1] == pytest.approx(duration - DeadlineTimer.WARNING_LEAD, abs=0.002)
+
+
+def test_short_session_gets_no_late_warning():
+    events, _ = run_until_expired(1.5, False)
+    assert [name for name, _ in events] == ['expired']
+
+
+def test_low_power_wakes_rarely():
+    events, timer = run_until_expired(25 * 60, True)
+    assert timer.wakeups <= 28
@@ -0,0 +1,55 @@
+from timer_scheduler import DeadlineScheduler, TimerPool
+from timer_core import VirtualClock
+
+
+def test_pops_keys_in_deadline_order():
+    scheduler = DeadlineScheduler()
+    scheduler.schedule('b', 20)
+    scheduler.schedule('a', 10)
+    scheduler.schedule('c', 30)
+    assert scheduler.next_deadline() == 10
+    assert scheduler.pop_due(25) == ['a', 'b']
+    assert len(scheduler) == 1
+    assert scheduler.next_deadline() == 30
+
+
+def test_reschedule_replaces_the_old_deadline():
+    scheduler = DeadlineScheduler()
+    scheduler.schedule('a', 10)
+    scheduler.schedule('a', 50)
+    assert scheduler.next_deadline() == 50
+    assert scheduler.pop_due(20) == []
+    assert scheduler.pop_due(50) == ['a']
+
+
+def test_cancel_removes_the_key():
+    scheduler = DeadlineScheduler()
+    scheduler.schedule('a', 10)
+    scheduler.schedule('b', 20)
+    scheduler.cancel('a')
+    scheduler.cancel('missing')
+    assert scheduler.next_deadline() == 20
+    assert scheduler.pop_due(100) == ['b']
+    assert scheduler.next_deadline() is None
+
+
+def test_stale_entries_are_compacted():
+    scheduler = DeadlineScheduler()
+    for deadline in range(1000):
+        scheduler.schedule('a', deadline)
+    assert len(scheduler._heap) <= 2 * len(scheduler) + 65
+    assert scheduler.pop_due(1000) == ['a']
+
+
+def test_pool_expires_only_finished_timers():
+    clock = VirtualClock()
+    pool = TimerPool(clock=clock)
+    first = pool.add('first', work_duration=60)
+    second = pool.add('second', work_duration=120)
+    pool.apply(first, 'start')
+    pool.apply(second, 'start')
+    pool.apply(second, 'pause')
+    assert pool.active_count() == 1
+    clock.advance(60)
+    assert pool.expire_due() == [first]
+    assert pool.active_count() == 0
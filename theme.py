@@ -0,0 +1,84 @@
+import time
+
+from PyQt5.QtGui import QColor
+
+
+STYLESHEET = """
+TimerDisplay#timerLabel {{ font-size: 30px; color: {font}; background-color: {background}; padding: 10px; border-radius: 10px; }}
+QPushButton#controlButton {{ background-color: {background}; padding: 5px; border-radius: 5px; }}
+QListView#taskList {{ background: transparent; }}
+QLineEdit#taskSearch {{ color: {font}; background-color: {background}; border: none; padding: 3px; border-radius: 5px; }}
+QLabel#completedTasksLabel {{ font-size: 14px; color: {font}; background: transparent; padding: 5px; border-radius: 5px; }}
+"""
+
+
+def css_rgba(color):
+    return f"rgba({color.red()}, {color.green()}, {color.blue()}, {color.alpha()})"
+
+
+class Theme:
+    def __init__(self, background=None, font_color=None, opacity=0.5):
+        self.background = background if background is not None else QColor(0, 0, 0, 128)
+        self.font_color = font_color if font_color is not None else QColor('#FFFFFF')
+        self.opacity = opacity
+        self._stylesheet = None
+        self._applied = None
+        self.applies = 0
+        self.last_apply_ms = 0.0
+
+    @classmethod
+    def from_settings(cls, settings):
+        opacity = settings.value('windowOpacity', 0.5, type=float)
+        background = cls.parse_background(settings.value('backgroundColor', "0, 0, 0, 0.5"))
+        font_color = QColor(settings.value('fontColor', "#FFFFFF"))  # Default to white if not set
+        return cls(background, font_color, opacity)
+
+    def save(self, settings):
+        settings.set('windowOpacity', self.opacity)
+        settings.set('backgroundColor', self.background_setting())
+        settings.set('fontColor', self.font_color.name())
+
+    @staticmethod
+    def parse_background(value):
+        # Settings keep the historical "r, g, b, alpha" form with alpha in 0..1.
+        try:
+            red, green, blue, alpha = (part.strip() for part in value.split(','))
+            return QColor(int(red), int(green), int(blue), round(float(alpha) * 255))
+        except ValueError:
+            return QColor(0, 0, 0, 128)
+
+    def background_setting(self):
+        color = self.background
+        return f"{color.red()}, {color.green()}, {color.blue()}, {color.alpha() / 255}"
+
+    def set_background(self, color):
+        self.background = QColor(color)
+        self._stylesheet = None
+
+    def set_font_color(self, color):
+        self.font_color = QColor(color)
+        self._stylesheet = None
+
+    def stylesheet(self):
+        if self._stylesheet is None:
+            self._stylesheet = STYLESHEET.format(font=self.font_color.name(), background=css_rgba(self.background))
+        return self._stylesheet
+
+    def stats(self):
+        return {
+            'applies': self.applies,
+            'last_apply_ms': self.last_apply_ms,
+        }
+
+    def apply(self, widget):
+        # One stylesheet on the top-level widget repolishes every themed
+        # child in a single pass; reapplying an unchanged theme is free.
+        stylesheet = self.stylesheet()
+        if stylesheet == self._applied:
+            return
+        started = time.perf_counter()
+        widget.setStyleSheet(stylesheet)
+        widget.ensurePolished()
+        self._applied = stylesheet
+        self.applies += 1
+        self.last_apply_ms = (time.perf_counter() - started) * 1000
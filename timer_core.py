@@ -0,0 +1,197 @@
+import math
+import time
+from collections import namedtuple
+
+
+# CLOCK_BOOTTIME keeps counting while the machine is suspended, so a session
+# that spans a laptop sleep still ends at the right wall-clock moment.
+if hasattr(time, 'CLOCK_BOOTTIME'):
+    def monotonic():
+        return time.clock_gettime(time.CLOCK_BOOTTIME)
+else:
+    monotonic = time.monotonic
+
+
+class Countdown:
+    def __init__(self, duration=0, clock=monotonic):
+        self.clock = clock
+        self.duration = duration
+        self.deadline = None
+        self._remaining = duration
+
+    @property
+    def is_active(self):
+        return self.deadline is not None
+
+    def reset(self, duration=None):
+        if duration is not None:
+            self.duration = duration
+        self.deadline = None
+        self._remaining = self.duration
+
+    def start(self):
+        if self.deadline is None:
+            self.deadline = self.clock() + self._remaining
+
+    def pause(self):
+        if self.deadline is not None:
+            self._remaining = max(0.0, self.deadline - self.clock())
+            self.deadline = None
+
+    def set_remaining(self, remaining):
+        self.deadline = None
+        self._remaining = remaining
+
+    def remaining(self):
+        if self.deadline is None:
+            return self._remaining
+        return max(0.0, self.deadline - self.clock())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def display_seconds(self, remaining=None):
+        if remaining is None:
+            remaining = self.remaining()
+        # Round up so 24:59.2 still reads 25:00 and 00:00 only shows at expiry.
+        return max(0, math.ceil(remaining - 1e-6))
+
+    def next_boundary(self, remaining=None):
+        # Seconds until the displayed mm:ss changes.
+        if remaining is None:
+            remaining = self.remaining()
+        fraction = remaining % 1.0
+        return fraction if fraction > 1e-6 else 1.0
+
+
+class VirtualClock:
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+# kind is 'work' or 'break'; started_at/ended_at are wall-clock timestamps,
+# elapsed is the seconds actually counted down.
+Session = namedtuple('Session', 'kind started_at ended_at elapsed completed interruptions')
+
+
+class PomodoroCore:
+    def __init__(self, work_duration=25 * 60, break_duration=5 * 60, clock=monotonic, wall_clock=time.time):
+        self.work_duration = work_duration
+        self.break_duration = break_duration
+        self.is_break = False
+        self.is_running = False  # A session has been started and not finished or reset
+        self.countdown = Countdown(work_duration, clock)
+        self.wall_clock = wall_clock
+        self.session_started_at = None
+        self.interruptions = 0
+        self.session_listeners = []  # called with a Session whenever one ends
+        self.transitions = 0
+        self.completed_sessions = 0
+
+    @property
+    def is_active(self):
+        return self.countdown.is_active
+
+    def session_duration(self):
+        return self.break_duration if self.is_break else self.work_duration
+
+    def remaining(self):
+        return self.countdown.remaining()
+
+    def display_seconds(self):
+        return self.countdown.display_seconds()
+
+    def start(self):
+        if not self.is_running:
+            self.countdown.reset(self.session_duration())
+            self.is_running = True
+            self._begin_session()
+        self.countdown.start()
+        self.transitions += 1
+
+    def pause(self):
+        if self.is_active:
+            self.interruptions += 1
+        self.countdown.pause()
+        self.transitions += 1
+
+    def toggle(self):
+        if self.is_active:
+            self.pause()
+        else:
+            self.start()
+
+    def reset(self):
+        if self.is_running:
+            self._end_session(False)
+        self.countdown.reset(self.session_duration())
+        self.is_running = False
+        self.transitions += 1
+
+    def toggle_break(self):
+        if self.is_running:
+            self._end_session(False)
+        self.is_break = not self.is_break
+        self.countdown.reset(self.session_duration())
+        self.countdown.start()
+        self.is_running = True
+        self._begin_session()
+        self.transitions += 1
+
+    def set_durations(self, work_duration=None, break_duration=None):
+        if work_duration is not None:
+            self.work_duration = work_duration
+        if break_duration is not None:
+            self.break_duration = break_duration
+        changed = break_duration if self.is_break else work_duration
+        if changed is not None:
+            was_active = self.is_active
+            self.countdown.reset(changed)
+            if was_active:
+                self.countdown.start()
+
+    def restore(self, is_break, duration, remaining, active, started_at, interruptions):
+        # Put back a session saved by another process; see checkpoint.py.
+        self.is_break = is_break
+        self.is_running = True
+        self.countdown.reset(duration)
+        self.countdown.set_remaining(remaining)
+        if active:
+            self.countdown.start()
+        self.session_started_at = started_at
+        self.interruptions = interruptions
+
+    def poll(self):
+        # Returns True exactly once when the running session reaches zero.
+        if not self.is_active or not self.countdown.expired():
+            return False
+        self._end_session(True)
+        self.countdown.reset(self.session_duration())
+        self.is_running = False
+        self.completed_sessions += 1
+        self.transitions += 1
+        return True
+
+    def _begin_session(self):
+        self.session_started_at = self.wall_clock()
+        self.interruptions = 0
+
+    def _end_session(self, completed):
+        if not self.session_listeners:
+            return
+        session = Session(
+            'break' if self.is_break else 'work',
+            self.session_started_at,
+            self.wall_clock(),
+            self.countdown.duration - self.countdown.remaining(),
+            completed,
+            self.interruptions,
+        )
+        for listener in self.session_listeners:
+            listener(session)
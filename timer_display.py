@@ -0,0 +1,154 @@
+import time
+
+from PyQt5.QtCore import Qt, QEvent, QRect, QSize, pyqtSignal
+from PyQt5.QtGui import QPainter, QPalette, QPixmap
+from PyQt5.QtWidgets import QStyle, QStyleOption, QWidget
+
+
+class TimerDisplay(QWidget):
+    # Paints the mm:ss readout from cached per-character pixmaps and only
+    # invalidates the cells whose character changed. Font, color and
+    # background come from the stylesheet like any other widget.
+    exposedChanged = pyqtSignal(bool)
+
+    PADDING = 10
+    DIGITS = '0123456789'
+
+    def __init__(self, text='', parent=None):
+        super().__init__(parent)
+        self._text = text
+        self._glyphs = {}
+        self._cells = {}  # character -> cell width
+        self._watched_window = None
+        self.exposed = True
+        self.repaints = 0
+        self.skipped_updates = 0
+        self.last_frame_ms = 0.0
+        self.total_frame_ms = 0.0
+        self.setAttribute(Qt.WA_StyledBackground)
+
+    def text(self):
+        return self._text
+
+    def setText(self, text):
+        if text == self._text:
+            return
+        previous, self._text = self._text, text
+        if not self._is_rendering():
+            # Nothing on screen to update; the next expose repaints the
+            # whole widget with the latest text.
+            self.skipped_updates += 1
+            return
+        if len(previous) != len(text):
+            self.update()
+            return
+        dirty = QRect()
+        for cell, old, new in zip(self._cell_rects(text), previous, text):
+            if old != new:
+                dirty = dirty.united(cell)
+        self.update(dirty)
+
+    def stats(self):
+        return {
+            'repaints': self.repaints,
+            'skipped_updates': self.skipped_updates,
+            'last_frame_ms': self.last_frame_ms,
+            'mean_frame_ms': self.total_frame_ms / self.repaints if self.repaints else 0.0,
+        }
+
+    def sizeHint(self):
+        width = sum(self._cell_width(char) for char in self._text)
+        return QSize(width, self.fontMetrics().height()) + QSize(2 * self.PADDING, 2 * self.PADDING)
+
+    def minimumSizeHint(self):
+        return self.sizeHint()
+
+    def _is_rendering(self):
+        window = self.window()
+        return self.isVisible() and self.exposed and not window.isMinimized()
+
+    def _cell_width(self, char):
+        width = self._cells.get(char)
+        if width is None:
+            metrics = self.fontMetrics()
+            if char in self.DIGITS:
+                # Every digit gets the widest digit's cell so the readout
+                # does not jitter as the numbers change.
+                width = max(metrics.horizontalAdvance(digit) for digit in self.DIGITS)
+            else:
+                width = metrics.horizontalAdvance(char)
+            self._cells[char] = width
+        return width
+
+    def _cell_rects(self, text):
+        widths = [self._cell_width(char) for char in text]
+        height = self.fontMetrics().height()
+        x = (self.width() - sum(widths)) // 2
+        y = (self.height() - height) // 2
+        rects = []
+        for width in widths:
+            rects.append(QRect(x, y, width, height))
+            x += width
+        return rects
+
+    def _glyph(self, char):
+        pixmap = self._glyphs.get(char)
+        if pixmap is None:
+            ratio = self.devicePixelRatioF()
+            size = QSize(self._cell_width(char), self.fontMetrics().height())
+            pixmap = QPixmap(size * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setFont(self.font())
+            painter.setPen(self.palette().color(QPalette.WindowText))
+            painter.drawText(QRect(0, 0, size.width(), size.height()), Qt.AlignCenter, char)
+            painter.end()
+            self._glyphs[char] = pixmap
+        return pixmap
+
+    def _invalidate(self):
+        self._glyphs.clear()
+        self._cells.clear()
+        self.updateGeometry()
+        self.update()
+
+    def paintEvent(self, event):
+        started = time.perf_counter()
+        painter = QPainter(self)
+        option = QStyleOption()
+        option.initFrom(self)
+        self.style().drawPrimitive(QStyle.PE_Widget, option, painter, self)
+        area = event.rect()
+        for cell, char in zip(self._cell_rects(self._text), self._text):
+            if cell.intersects(area):
+                painter.drawPixmap(cell.topLeft(), self._glyph(char))
+        painter.end()
+        elapsed = (time.perf_counter() - started) * 1000
+        self.repaints += 1
+        self.last_frame_ms = elapsed
+        self.total_frame_ms += elapsed
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.FontChange, QEvent.PaletteChange, QEvent.StyleChange):
+            self._invalidate()
+        super().changeEvent(event)
+
+    def showEvent(self, event):
+        # The QWindow only exists once the top-level is shown; watch it for
+        # expose changes so covered or off-screen windows stop rendering.
+        handle = self.window().windowHandle()
+        if handle is not None and handle is not self._watched_window:
+            handle.installEventFilter(self)
+            self._watched_window = handle
+        super().showEvent(event)
+
+    def eventFilter(self, obj, event):
+        if obj is self._watched_window and event.type() == QEvent.Expose:
+            exposed = obj.isExposed()
+            if exposed != self.exposed:
+                self.exposed = exposed
+                self.exposedChanged.emit(exposed)
+                if exposed:
+                    self.update()
+        return False
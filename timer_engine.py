@@ -0,0 +1,96 @@
+import math
+
+from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal
+
+from instrumentation import metrics
+
+
+class DeadlineTimer(QObject):
+    tick = pyqtSignal(int)
+    expired = pyqtSignal()
+    warning = pyqtSignal()  # emitted once, WARNING_LEAD seconds before expiry
+
+    # Coarse timers may fire up to 5% early; stretching the interval by the
+    # same factor keeps every wakeup on or just after a display-second edge.
+    COARSE_TOLERANCE = 0.05
+    LOW_POWER_INTERVAL = 60
+    WARNING_LEAD = 2
+
+    def __init__(self, core, parent=None):
+        super().__init__(parent)
+        self.core = core
+        self.low_power = False
+        self.wakeups = 0
+        self._last_seconds = None
+        self._warned = False
+        self._target = None  # clock time the pending wakeup was requested for
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.CoarseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def isActive(self):
+        return self.core.is_active
+
+    def sync(self):
+        # Call after every core transition to refresh the display and reschedule.
+        self._timer.stop()
+        self._last_seconds = self.core.display_seconds()
+        self._warned = self.core.remaining() <= self.WARNING_LEAD
+        self.tick.emit(self._last_seconds)
+        if self.core.is_active:
+            self._schedule()
+
+    def set_low_power(self, enabled):
+        if enabled == self.low_power:
+            return
+        self.low_power = enabled
+        if self.core.is_active:
+            self._timer.stop()
+            self._on_timeout()
+
+    def _schedule(self):
+        remaining = self.core.remaining()
+        if remaining <= 0:
+            delay = 0
+        elif self.low_power:
+            delay = min(remaining, self.LOW_POWER_INTERVAL)
+        else:
+            delay = self.core.countdown.next_boundary(remaining)
+        stretched = delay / (1 - self.COARSE_TOLERANCE)
+        warn_in = remaining - self.WARNING_LEAD
+        if not self._warned and warn_in > 0 and stretched >= warn_in:
+            # Likewise the warning: stretched, a long low-power wait would
+            # sail past it and the session would end without a warm-up.
+            self._start(warn_in, Qt.PreciseTimer)
+        elif stretched >= remaining:
+            # The stretch is only for display-second edges. A wakeup that
+            # would reach the deadline lands on it exactly instead, and a
+            # precise timer keeps coarse slop off the session end.
+            self._start(remaining, Qt.PreciseTimer)
+        else:
+            self._start(stretched, Qt.CoarseTimer)
+
+    def _start(self, delay, timer_type):
+        interval = int(math.ceil(delay * 1000))
+        self._target = self.core.countdown.clock() + interval / 1000
+        self._timer.setTimerType(timer_type)
+        self._timer.start(interval)
+
+    def _on_timeout(self):
+        self.wakeups += 1
+        if metrics.enabled and self._target is not None:
+            metrics.observe('tick_lateness', max(0.0, (self.core.countdown.clock() - self._target) * 1000))
+        if self.core.poll():
+            self._last_seconds = 0
+            self.tick.emit(0)
+            self.expired.emit()
+            return
+        if not self._warned and self.core.remaining() <= self.WARNING_LEAD:
+            self._warned = True
+            self.warning.emit()
+        seconds = self.core.display_seconds()
+        if seconds != self._last_seconds:
+            self._last_seconds = seconds
+            self.tick.emit(seconds)
+        self._schedule()
@@ -0,0 +1,89 @@
+import heapq
+import itertools
+
+from timer_core import PomodoroCore, monotonic
+
+
+class DeadlineScheduler:
+    def __init__(self):
+        self._heap = []  # (deadline, sequence, key)
+        self._deadlines = {}  # key -> deadline currently scheduled
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def schedule(self, key, deadline):
+        # Rescheduling leaves the old heap entry behind; it is skipped when
+        # it surfaces because it no longer matches _deadlines.
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._sequence), key))
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._compact()
+
+    def cancel(self, key):
+        self._deadlines.pop(key, None)
+
+    def next_deadline(self):
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now):
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(heap)
+            if self._deadlines.get(key) == deadline:
+                del self._deadlines[key]
+                due.append(key)
+        return due
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if self._deadlines.get(entry[2]) == entry[0]]
+        heapq.heapify(self._heap)
+
+
+class TimerPool:
+    def __init__(self, clock=monotonic):
+        self.clock = clock
+        self.names = []
+        self.cores = []
+        self.scheduler = DeadlineScheduler()
+
+    def __len__(self):
+        return len(self.cores)
+
+    def add(self, name, work_duration=25 * 60, break_duration=5 * 60):
+        self.names.append(name)
+        self.cores.append(PomodoroCore(work_duration, break_duration, clock=self.clock))
+        return len(self.cores) - 1
+
+    def apply(self, index, action):
+        # action is one of the PomodoroCore transitions: 'start', 'pause',
+        # 'toggle', 'reset' or 'toggle_break'.
+        getattr(self.cores[index], action)()
+        self.reschedule(index)
+
+    def reschedule(self, index):
+        countdown = self.cores[index].countdown
+        if countdown.is_active:
+            self.scheduler.schedule(index, countdown.deadline)
+        else:
+            self.scheduler.cancel(index)
+
+    def next_deadline(self):
+        return self.scheduler.next_deadline()
+
+    def expire_due(self):
+        finished = []
+        for index in self.scheduler.pop_due(self.clock()):
+            if self.cores[index].poll():
+                finished.append(index)
+            else:
+                self.reschedule(index)
+        return finished
+
+    def active_count(self):
+        return len(self.scheduler)